@@ -15,12 +15,14 @@ def list_customers(
 ):
     """Get paginated customers for a business (requires owner or admin role)."""
     result = CustomerRepository.get_paginated(ctx.business_id, limit=limit, offset=offset)
-    return PaginatedCustomerResponse(
-        data=[CustomerResponse(**c) for c in result["data"]],
-        total=result["total"],
-        limit=limit,
-        offset=offset,
-    )
+    # Rows are validated once, against response_model, rather than once per
+    # CustomerResponse here and again on serialization
+    return {
+        "data": result["data"],
+        "total": result["total"],
+        "limit": limit,
+        "offset": offset,
+    }
 
 
 @router.get("/{business_id}/{customer_id}", response_model=CustomerResponse)
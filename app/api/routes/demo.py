@@ -219,9 +219,10 @@ async def get_demo_pass(
             selection_url = f"{settings.showcase_url}/demo/wallet-select/{session_token}"
             return RedirectResponse(url=selection_url, status_code=302)
 
-    # iOS: generate and serve Apple Wallet pass
+    # iOS: generate and serve Apple Wallet pass (CPU-bound, keep it off the event loop)
     generator = create_demo_pass_generator()
-    pass_data = generator.generate_demo_pass(
+    pass_data = await asyncio.to_thread(
+        generator.generate_demo_pass,
         customer_id=customer_id,
         stamps=stamps,
         auth_token=auth_token,
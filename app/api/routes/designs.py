@@ -395,7 +395,8 @@ async def activate_design(
     design = CardDesignRepository.set_active(ctx.business_id, design_id)
 
     # Handle activation: update Google class and notify customers
-    result = coordinator.on_design_activated(business, design)
+    # (blocking Storage/Wallet calls, so keep them off the event loop)
+    result = await asyncio.to_thread(coordinator.on_design_activated, business, design)
 
     # Send notifications to all customers in background
     async def notify_all_customers():
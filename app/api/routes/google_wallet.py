@@ -9,7 +9,7 @@ Handles callbacks from Google Wallet when:
 import json
 import logging
 
-from fastapi import APIRouter, Body, Response, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Body
 
 from app.repositories.callback_nonce import CallbackNonceRepository
 from app.services.wallets.google import create_google_wallet_service
@@ -21,6 +21,7 @@ router = APIRouter()
 
 @router.post("/callback")
 def google_wallet_callback(
+    background_tasks: BackgroundTasks,
     body: dict = Body(...),
 ):
     """
@@ -37,7 +38,8 @@ def google_wallet_callback(
     - nonce: Unique identifier for deduplication
 
     Returns:
-        200 OK if callback was processed successfully
+        200 OK once the callback is accepted; it is processed in the
+        background
     """
     # Parse the signedMessage - Google sends the actual data as a JSON string
     # inside the signedMessage field (part of their signing protocol)
@@ -48,27 +50,33 @@ def google_wallet_callback(
         except json.JSONDecodeError as e:
             logger.error(f"[Google Wallet Callback] Failed to parse signedMessage: {e}")
 
+    # Acknowledge right away; Google only needs the 2xx, and the
+    # deduplication and registration writes run after the response is sent
+    background_tasks.add_task(_process_callback, callback_data)
+    return {"status": "ok"}
+
+
+def _process_callback(callback_data: dict) -> None:
+    """Deduplicate and apply a Google Wallet callback."""
     # Extract nonce for deduplication
     nonce = callback_data.get("nonce")
 
-    if nonce:
-        # Check if we've already processed this callback
-        if CallbackNonceRepository.exists(nonce):
-            return Response(status_code=200)
+    try:
+        if nonce:
+            # Check if we've already processed this callback
+            if CallbackNonceRepository.exists(nonce):
+                return
 
-        # Mark nonce as processed
-        CallbackNonceRepository.mark_processed(nonce)
+            # Mark nonce as processed
+            CallbackNonceRepository.mark_processed(nonce)
 
-    # Process the callback
-    try:
+        # Process the callback
         google_service = create_google_wallet_service()
         google_service.handle_callback(callback_data)
-        return {"status": "ok"}
 
     except Exception as e:
-        # Log error but still return 200 to prevent retries
+        # Google already got its 200, so just log
         logger.error(f"[Google Wallet Callback] Error processing callback: {e}", exc_info=True)
-        return {"status": "error", "message": str(e)}
 
 
 @router.get("/callback")
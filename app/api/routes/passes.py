@@ -1,15 +1,25 @@
-from fastapi import APIRouter, HTTPException, Request, Response
+import re
+
+from fastapi import APIRouter, HTTPException, Header, Request, Response
 
 from app.repositories.customer import CustomerRepository
-from app.services.pass_generator import create_pass_generator_with_active_design, create_pass_generator
+from app.services.pass_generator import create_pass_generator_with_active_design, create_pass_generator, etag_matches
 from app.core.rate_limit import limiter
 
 router = APIRouter()
 
+# Characters dropped from the Content-Disposition filename: anything outside
+# printable ASCII, plus the double quote that would end the quoted value
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^\x20-\x7e]|"')
+
 
 @router.get("/{customer_id}")
 @limiter.limit("30/minute")
-def download_pass(request: Request, customer_id: str):
+def download_pass(
+    request: Request,
+    customer_id: str,
+    if_none_match: str | None = Header(None, alias="If-None-Match"),
+):
     """Download the .pkpass file for a customer."""
     customer = CustomerRepository.get_by_id(customer_id)
     if not customer:
@@ -23,7 +33,7 @@ def download_pass(request: Request, customer_id: str):
     else:
         pass_generator = create_pass_generator()
 
-    pass_data = pass_generator.generate_pass(
+    pass_args = dict(
         customer_id=customer["id"],
         name=customer["name"],
         stamps=customer["stamps"],
@@ -31,14 +41,21 @@ def download_pass(request: Request, customer_id: str):
         business_id=business_id,
     )
 
-    safe_name = customer["name"].encode("ascii", "ignore").decode("ascii").replace('"', "")
-    if not safe_name:
-        safe_name = "loyalty-card"
+    # Skip generation entirely when the client already has this pass
+    etag = pass_generator.pass_etag(**pass_args)
+    cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=cache_headers)
+
+    pass_data = pass_generator.generate_pass(**pass_args)
+
+    safe_name = _UNSAFE_FILENAME_CHARS.sub("", customer["name"]) or "loyalty-card"
 
     return Response(
         content=pass_data,
         media_type="application/vnd.apple.pkpass",
         headers={
             "Content-Disposition": f'attachment; filename="{safe_name}-loyalty.pkpass"',
+            **cache_headers,
         },
     )
@@ -1,6 +1,7 @@
+import asyncio
 import logging
 
-from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Request
 
 from app.domain.schemas import StampResponse, VoidStampRequest
 from app.repositories.customer import CustomerRepository
@@ -24,11 +25,34 @@ def get_pass_coordinator() -> PassCoordinator:
     return create_pass_coordinator()
 
 
+async def _update_wallets(
+    coordinator: PassCoordinator,
+    customer: dict,
+    business_id: str,
+    stamps: int,
+) -> None:
+    """Push a new stamp count to Apple and Google Wallet (runs after the response)."""
+    try:
+        business, design = await asyncio.gather(
+            asyncio.to_thread(BusinessRepository.get_by_id, business_id),
+            asyncio.to_thread(CardDesignRepository.get_active, business_id),
+        )
+        if business and design:
+            await coordinator.on_stamp_added(
+                customer={**customer, "stamps": stamps},
+                business=business,
+                design=design,
+            )
+    except Exception as e:
+        logger.error(f"[Stamps] Wallet update error: {e}", exc_info=True)
+
+
 @router.post("/{business_id}/{customer_id}", response_model=StampResponse)
 @limiter.limit("60/minute")
 async def add_customer_stamp(
     request: Request,
     customer_id: str,
+    background_tasks: BackgroundTasks,
     ctx: BusinessAccessContext = Depends(require_any_access),
     coordinator: PassCoordinator = Depends(get_pass_coordinator),
 ):
@@ -76,20 +100,11 @@ async def add_customer_stamp(
     except Exception:
         pass
 
-    # Update wallets (Apple via push, Google via API update)
-    business = BusinessRepository.get_by_id(ctx.business_id)
-    design = CardDesignRepository.get_active(ctx.business_id)
-    updated_customer = {**customer, "stamps": result.value_after}
-
-    if business and design:
-        try:
-            await coordinator.on_stamp_added(
-                customer=updated_customer,
-                business=business,
-                design=design,
-            )
-        except Exception as e:
-            logger.error(f"[Stamps] Wallet update error: {e}", exc_info=True)
+    # Update wallets (Apple via push, Google via API update) once the
+    # response is sent, so the scanner isn't waiting on APNs/Google
+    background_tasks.add_task(
+        _update_wallets, coordinator, customer, ctx.business_id, result.value_after
+    )
 
     message = "Stamp added!"
     if result.reward_earned:
@@ -109,6 +124,7 @@ async def add_customer_stamp(
 @router.post("/{business_id}/{customer_id}/redeem", response_model=StampResponse)
 async def redeem_customer_reward(
     customer_id: str,
+    background_tasks: BackgroundTasks,
     ctx: BusinessAccessContext = Depends(require_any_access),
     coordinator: PassCoordinator = Depends(get_pass_coordinator),
 ):
@@ -152,20 +168,10 @@ async def redeem_customer_reward(
     except Exception:
         pass
 
-    # Update wallets
-    business = BusinessRepository.get_by_id(ctx.business_id)
-    design = CardDesignRepository.get_active(ctx.business_id)
-    updated_customer = {**customer, "stamps": result.value_after}
-
-    if business and design:
-        try:
-            await coordinator.on_stamp_added(
-                customer=updated_customer,
-                business=business,
-                design=design,
-            )
-        except Exception as e:
-            logger.error(f"[Stamps] Wallet update error on redemption: {e}", exc_info=True)
+    # Update wallets once the response is sent
+    background_tasks.add_task(
+        _update_wallets, coordinator, customer, ctx.business_id, result.value_after
+    )
 
     return StampResponse(
         customer_id=customer_id,
@@ -180,6 +186,7 @@ async def redeem_customer_reward(
 async def void_customer_stamp(
     customer_id: str,
     body: VoidStampRequest,
+    background_tasks: BackgroundTasks,
     ctx: BusinessAccessContext = Depends(require_any_access),
     coordinator: PassCoordinator = Depends(get_pass_coordinator),
 ):
@@ -249,20 +256,10 @@ async def void_customer_stamp(
     except Exception:
         logger.error("[Stamps] Failed to log void transaction", exc_info=True)
 
-    # Update wallets
-    design = CardDesignRepository.get_active(ctx.business_id)
-    business = BusinessRepository.get_by_id(ctx.business_id)
-    updated_customer = {**customer, "stamps": new_stamps}
-
-    if business and design:
-        try:
-            await coordinator.on_stamp_added(
-                customer=updated_customer,
-                business=business,
-                design=design,
-            )
-        except Exception as e:
-            logger.error(f"[Stamps] Wallet update error on void: {e}", exc_info=True)
+    # Update wallets once the response is sent
+    background_tasks.add_task(
+        _update_wallets, coordinator, customer, ctx.business_id, new_stamps
+    )
 
     return StampResponse(
         customer_id=customer_id,
@@ -8,7 +8,7 @@ from app.repositories.customer import CustomerRepository
 from app.repositories.device import DeviceRepository
 from app.repositories.card_design import CardDesignRepository
 from app.repositories.business import BusinessRepository
-from app.services.pass_generator import create_pass_generator_for_business, create_pass_generator
+from app.services.pass_generator import create_pass_generator_for_business, create_pass_generator, etag_matches
 from app.core.security import verify_auth_token
 from app.core.rate_limit import limiter
 
@@ -121,14 +121,18 @@ def get_serial_numbers(
             since_dt = datetime.fromtimestamp(since_timestamp, tz=timezone.utc)
 
             filtered = []
+            # One bulk customer query, then design/business once per business
+            customers = CustomerRepository.get_by_ids(serial_numbers)
+            design_cache = {}
             business_cache = {}
             for serial_number in serial_numbers:
-                customer = CustomerRepository.get_by_id(serial_number)
+                customer = customers.get(serial_number)
                 if customer:
                     bid = customer.get("business_id")
-                    design = CardDesignRepository.get_active(bid)
                     if bid not in business_cache:
+                        design_cache[bid] = CardDesignRepository.get_active(bid)
                         business_cache[bid] = BusinessRepository.get_by_id(bid)
+                    design = design_cache[bid]
                     business = business_cache[bid]
                     last_modified = _get_last_modified(customer, design, business)
 
@@ -155,6 +159,7 @@ def get_latest_pass(
     serial_number: str,
     authorization: str | None = Header(None),
     if_modified_since: str | None = Header(None, alias="If-Modified-Since"),
+    if_none_match: str | None = Header(None, alias="If-None-Match"),
 ):
     """Download the latest version of a pass."""
     auth_token = verify_auth_token(authorization)
@@ -203,7 +208,7 @@ def get_latest_pass(
     else:
         pass_generator = create_pass_generator()
 
-    pass_data = pass_generator.generate_pass(
+    pass_args = dict(
         customer_id=customer["id"],
         name=customer["name"],
         stamps=customer["stamps"],
@@ -211,17 +216,22 @@ def get_latest_pass(
         business_id=business_id,
     )
 
+    etag = pass_generator.pass_etag(**pass_args)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
     # Format Last-Modified header properly (RFC 7231)
-    last_modified_header = ""
     if last_modified:
-        last_modified_header = formatdate(last_modified.timestamp(), usegmt=True)
+        headers["Last-Modified"] = formatdate(last_modified.timestamp(), usegmt=True)
+
+    # Skip generation entirely when the device already has this pass
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    pass_data = pass_generator.generate_pass(**pass_args)
 
     return Response(
         content=pass_data,
         media_type="application/vnd.apple.pkpass",
-        headers={
-            "Last-Modified": last_modified_header,
-        },
+        headers=headers,
     )
 
 
@@ -1,4 +1,5 @@
 import os
+import time
 from functools import lru_cache
 
 from pydantic_settings import BaseSettings
@@ -141,6 +142,11 @@ def get_settings() -> Settings:
 
 settings = get_settings()
 
+# Tunnel URL cache: (expiry_timestamp, url). The URL is read for every pass
+# and callback URL, but only changes when cloudflared restarts.
+_tunnel_url_cache: tuple[float, str | None] = (0.0, None)
+_TUNNEL_URL_TTL = 30  # seconds
+
 
 def get_tunnel_url() -> str | None:
     """
@@ -152,11 +158,20 @@ def get_tunnel_url() -> str | None:
     Returns:
         The tunnel URL (e.g., "https://xxx.trycloudflare.com") or None if not available
     """
+    global _tunnel_url_cache
+    expires_at, tunnel_url = _tunnel_url_cache
+    now = time.monotonic()
+    if now < expires_at:
+        return tunnel_url
+
     try:
         with open(settings.tunnel_url_file, "r") as f:
-            return f.read().strip()
+            tunnel_url = f.read().strip()
     except FileNotFoundError:
-        return None
+        tunnel_url = None
+
+    _tunnel_url_cache = (now + _TUNNEL_URL_TTL, tunnel_url)
+    return tunnel_url
 
 
 def get_callback_url() -> str:
@@ -1,6 +1,10 @@
+import asyncio
 import logging
+import logging.handlers
 import os
+import queue
 import re
+import threading
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
@@ -12,6 +16,8 @@ from starlette.responses import Response
 from database import init_db
 from app.api import api_router
 from app.core.rate_limit import limiter
+from app.services.strip_generator import warm_icon_cache
+from app.services.wallets.google import reset_google_wallet_service
 
 # Configure logging
 logging.basicConfig(
@@ -30,12 +36,53 @@ logging.getLogger("storage3").setLevel(logging.WARNING)
 logging.getLogger("realtime").setLevel(logging.WARNING)
 
 
+def _start_log_listener() -> logging.handlers.QueueListener:
+    """Route root log records through a queue written by a listener thread.
+
+    Request handlers then never block on stderr. Done at startup rather than
+    import so importing this module doesn't start threads or rewire logging.
+    """
+    root_logger = logging.getLogger()
+    listener = logging.handlers.QueueListener(
+        queue.SimpleQueue(), *root_logger.handlers, respect_handler_level=True
+    )
+    root_logger.handlers = [logging.handlers.QueueHandler(listener.queue)]
+    listener.start()
+    return listener
+
+
+def _stop_log_listener(listener: logging.handlers.QueueListener) -> None:
+    """Flush queued records and give the root logger its handlers back."""
+    listener.stop()
+    logging.getLogger().handlers = list(listener.handlers)
+
+
+def _log_warm_result(task: asyncio.Task) -> None:
+    """Report the icon warm-up outcome instead of leaving its exception unretrieved."""
+    if task.cancelled():
+        return
+    error = task.exception()
+    if error is not None:
+        logger.error(f"Icon cache warm-up failed: {error!r}")
+    else:
+        logger.info(f"Icon cache warmed with {task.result()} icons")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    log_listener = _start_log_listener()
     init_db()
+    # Pre-render stamp icons in the background so startup isn't delayed.
+    # Cancelling the task wouldn't stop the worker thread, so it polls an event.
+    warm_stop = threading.Event()
+    warm_task = asyncio.create_task(asyncio.to_thread(warm_icon_cache, stop=warm_stop))
+    warm_task.add_done_callback(_log_warm_result)
     yield
     # Shutdown
+    warm_stop.set()
+    reset_google_wallet_service()
+    _stop_log_listener(log_listener)
 
 
 logger = logging.getLogger(__name__)
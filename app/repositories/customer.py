@@ -1,6 +1,18 @@
 from database.connection import get_db, with_retry
 
 
+def _merge_enrollment(row: dict) -> dict:
+    """Overlay the joined v2 enrollment's stamps/redemptions onto a customer row."""
+    enrollments = row.pop("enrollments", []) or []
+    enrollment = enrollments[0] if enrollments else None
+    if enrollment:
+        progress = enrollment.get("progress") or {}
+        row["stamps"] = progress.get("stamps", row.get("stamps", 0))
+        row["total_redemptions"] = enrollment.get("total_redemptions", row.get("total_redemptions", 0))
+        row["last_activity_at"] = enrollment.get("last_activity_at")
+    return row
+
+
 class CustomerRepository:
 
     @staticmethod
@@ -27,15 +39,24 @@ class CustomerRepository:
         ).eq("id", customer_id).limit(1).execute()
         if not result or not result.data:
             return None
-        row = result.data[0]
-        enrollments = row.pop("enrollments", []) or []
-        enrollment = enrollments[0] if enrollments else None
-        if enrollment:
-            progress = enrollment.get("progress") or {}
-            row["stamps"] = progress.get("stamps", row.get("stamps", 0))
-            row["total_redemptions"] = enrollment.get("total_redemptions", row.get("total_redemptions", 0))
-            row["last_activity_at"] = enrollment.get("last_activity_at")
-        return row
+        return _merge_enrollment(result.data[0])
+
+    @staticmethod
+    @with_retry()
+    def get_by_ids(customer_ids: list[str], batch_size: int = 100) -> dict[str, dict]:
+        """Get customers by ID in bulk, keyed by ID. Joins enrollment data from v2 tables.
+        IDs are queried in batches to keep request URLs short."""
+        db = get_db()
+        customers = {}
+        unique_ids = list(dict.fromkeys(customer_ids))
+        for start in range(0, len(unique_ids), batch_size):
+            batch = unique_ids[start:start + batch_size]
+            result = db.table("customers").select(
+                "*, enrollments(progress, total_redemptions, last_activity_at, status)"
+            ).in_("id", batch).execute()
+            for row in (result.data if result and result.data else []):
+                customers[row["id"]] = _merge_enrollment(row)
+        return customers
 
     @staticmethod
     @with_retry()
@@ -126,16 +147,10 @@ class CustomerRepository:
         ).order("created_at", desc=True).range(offset, offset + limit - 1)
         result = query.execute()
 
-        data = []
-        for row in (result.data if result and result.data else []):
-            enrollments = row.pop("enrollments", []) or []
-            enrollment = enrollments[0] if enrollments else None
-            if enrollment:
-                progress = enrollment.get("progress") or {}
-                row["stamps"] = progress.get("stamps", row.get("stamps", 0))
-                row["total_redemptions"] = enrollment.get("total_redemptions", row.get("total_redemptions", 0))
-                row["last_activity_at"] = enrollment.get("last_activity_at")
-            data.append(row)
+        data = [
+            _merge_enrollment(row)
+            for row in (result.data if result and result.data else [])
+        ]
 
         return {
             "data": data,
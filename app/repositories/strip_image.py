@@ -110,12 +110,38 @@ class StripImageRepository:
 
         return len(result.data) if result.data else 0
 
+    @staticmethod
+    @with_retry()
+    def replace_for_design(design_id: str, records: list[dict]) -> int:
+        """
+        Replace all strip image records of a design in one round trip.
+        Each record should have: stamp_count, platform, resolution, url
+
+        Rows for stamp counts/resolutions not in records are removed.
+        Returns number of records upserted.
+        """
+        db = get_db()
+        result = db.rpc("replace_strip_images", {
+            "p_design_id": design_id,
+            "p_records": [
+                {
+                    "stamp_count": r["stamp_count"],
+                    "platform": r["platform"],
+                    "resolution": r["resolution"],
+                    "url": r["url"],
+                }
+                for r in records
+            ],
+        }).execute()
+
+        return result.data if isinstance(result.data, int) else len(records)
+
     @staticmethod
     @with_retry()
     def delete_for_design(design_id: str) -> int:
         """
         Delete all strip images for a design.
-        Used when regenerating strips.
+        Used when a design is deleted.
 
         Returns number of records deleted.
         """
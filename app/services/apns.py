@@ -1,13 +1,32 @@
 import asyncio
+import hashlib
+import logging
+import weakref
+
+logger = logging.getLogger(__name__)
+
+
+def _close_aioapns_client(client) -> None:
+    """Close an aioapns client's connection pool (runs on its event loop)."""
+    pool = getattr(client, "pool", None)
+    if pool is None:
+        return
+    result = pool.close()
+    if asyncio.iscoroutine(result):
+        asyncio.ensure_future(result)
 
 
 class APNsClient:
     """Apple Push Notification service client for Wallet pass updates.
 
     Accepts either a cert file path (legacy) or PEM bytes (per-business).
-    When PEM bytes are provided, a temp file is created per push batch.
+    When PEM bytes are provided, a temp file is created while the underlying
+    aioapns client is built.
     """
 
+    # Pushes in flight per batch; APNs multiplexes them as HTTP/2 streams
+    MAX_CONCURRENT_PUSHES = 100
+
     def __init__(
         self,
         pass_type_id: str,
@@ -21,28 +40,51 @@ class APNsClient:
         self.apns_cert_pem = apns_cert_pem
         self.pass_type_id = pass_type_id
         self.use_sandbox = use_sandbox
-        # Only cache client when using file path (stable across calls)
-        self._client = None
+        # Identifies the credentials, so callers can tell whether a cached
+        # client is still valid after certs are reloaded
+        self.identity = (
+            pass_type_id,
+            use_sandbox,
+            cert_path,
+            hashlib.sha256(apns_cert_pem).hexdigest() if apns_cert_pem else None,
+        )
+        # aioapns clients keep their HTTP/2 connections open, so they are reused
+        # across push batches. Connections are bound to the event loop that
+        # opened them, hence one client per loop.
+        self._clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def _get_client(self):
+        """Get or create the APNs client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is not None:
+            return client
+
+        from aioapns import APNs
 
-    def _get_client(self, cert_path: str | None = None):
-        """Get or create the APNs client.
+        if self.apns_cert_pem:
+            # aioapns loads the cert into its SSL context on construction,
+            # so the temp file is only needed while the client is created
+            from app.services.certificate_manager import get_certificate_manager
+            cert_manager = get_certificate_manager()
+            with cert_manager.apns_cert_tempfile(self.apns_cert_pem) as temp_path:
+                client = APNs(client_cert=temp_path, use_sandbox=self.use_sandbox)
+        else:
+            client = APNs(client_cert=self.cert_path, use_sandbox=self.use_sandbox)
+
+        self._clients[loop] = client
+        return client
 
-        Args:
-            cert_path: Override cert path (for temp file usage).
-                       If None, uses self.cert_path with cached client.
+    def close(self) -> None:
+        """Close the connections opened on each event loop.
+
+        Safe to call from any thread; each close is scheduled on the loop
+        that owns the connections.
         """
-        if cert_path:
-            # Temp file path — create fresh client (not cached)
-            from aioapns import APNs
-            return APNs(client_cert=cert_path, use_sandbox=self.use_sandbox)
-
-        if self._client is None:
-            from aioapns import APNs
-            self._client = APNs(
-                client_cert=self.cert_path,
-                use_sandbox=self.use_sandbox,
-            )
-        return self._client
+        for loop, client in list(self._clients.items()):
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(_close_aioapns_client, client)
+        self._clients.clear()
 
     async def _send_single(self, push_token: str, client) -> bool:
         """Send a single push notification using the given client."""
@@ -58,46 +100,34 @@ class APNsClient:
             response = await client.send_notification(request)
 
             if response.is_successful:
-                print(f"Push sent successfully to {push_token[:20]}...")
+                logger.debug("Push sent successfully to %s...", push_token[:20])
                 return True
             else:
-                print(f"Push failed: {response.status} - {response.description}")
+                logger.warning("Push failed: %s - %s", response.status, response.description)
                 return False
 
         except Exception as e:
-            print(f"Push error: {e}")
+            logger.error("Push error: %s", e)
             return False
 
     async def send_pass_update(self, push_token: str) -> bool:
         """Send a push notification to update a Wallet pass."""
-        if self.apns_cert_pem:
-            from app.services.certificate_manager import get_certificate_manager
-            cert_manager = get_certificate_manager()
-            with cert_manager.apns_cert_tempfile(self.apns_cert_pem) as temp_path:
-                client = self._get_client(cert_path=temp_path)
-                return await self._send_single(push_token, client)
-        else:
-            client = self._get_client()
-            return await self._send_single(push_token, client)
+        client = self._get_client()
+        return await self._send_single(push_token, client)
 
     async def send_to_all_devices(self, push_tokens: list[str]) -> dict:
-        """Send push notifications to multiple devices.
-
-        When using PEM bytes, creates one temp file for the entire batch.
-        """
+        """Send push notifications to multiple devices over one client."""
         results = {"success": 0, "failed": 0}
 
-        if self.apns_cert_pem:
-            from app.services.certificate_manager import get_certificate_manager
-            cert_manager = get_certificate_manager()
-            with cert_manager.apns_cert_tempfile(self.apns_cert_pem) as temp_path:
-                client = self._get_client(cert_path=temp_path)
-                tasks = [self._send_single(token, client) for token in push_tokens]
-                outcomes = await asyncio.gather(*tasks, return_exceptions=True)
-        else:
-            client = self._get_client()
-            tasks = [self._send_single(token, client) for token in push_tokens]
-            outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+        client = self._get_client()
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_PUSHES)
+
+        async def _send_bounded(token: str) -> bool:
+            async with semaphore:
+                return await self._send_single(token, client)
+
+        tasks = [_send_bounded(token) for token in push_tokens]
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
 
         for outcome in outcomes:
             if outcome is True:
@@ -8,6 +8,7 @@ Handles:
 - Temp file management for aioapns (requires file path)
 """
 
+import functools
 import json
 import logging
 import os
@@ -138,8 +139,8 @@ class CertificateManager:
     def apns_cert_tempfile(self, apns_pem: bytes):
         """Context manager yielding a temp file path containing APNs PEM data.
 
-        aioapns requires a file path, so we write to a temp file per push batch.
-        OS guarantees unique path; auto-deleted on exit.
+        aioapns requires a file path, so we write to a temp file while its
+        client is created. OS guarantees unique path; auto-deleted on exit.
         """
         tmp = tempfile.NamedTemporaryFile(
             mode="wb", suffix=".pem", delete=True
@@ -156,9 +157,9 @@ class CertificateManager:
         """Load shared certs from Doppler-written files (dev/staging path)."""
         return (
             settings.apple_pass_type_id,
-            Path(settings.cert_path).read_bytes(),
-            Path(settings.key_path).read_bytes(),
-            Path(settings.apns_cert_path).read_bytes(),
+            load_pem_file(settings.cert_path),
+            load_pem_file(settings.key_path),
+            load_pem_file(settings.apns_cert_path),
         )
 
     def _get_from_memory_cache(
@@ -240,6 +241,17 @@ class CertificateManager:
         return record["identifier"], signer_cert, signer_key, apns_combined
 
 
+def load_pem_file(path: str) -> bytes:
+    """Read a cert/key file, cached in memory for the same TTL as business certs."""
+    return _read_pem_file(path, int(time.time() // _MEMORY_TTL))
+
+
+@functools.lru_cache(maxsize=16)
+def _read_pem_file(path: str, ttl_bucket: int) -> bytes:
+    """Read a file; ttl_bucket only partitions the cache so it expires."""
+    return Path(path).read_bytes()
+
+
 def _encode_blob(data) -> str:
     """Encode bytes to base64 string for JSON/Redis serialization."""
     import base64
@@ -1,11 +1,18 @@
-import json
 import hashlib
+import threading
+import time
 import zipfile
 import io
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 import httpx
+import orjson
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.serialization import pkcs7
 
 from app.services.strip_generator import StripImageGenerator, StripConfig
 from app.services.localization import get_system_string
@@ -13,6 +20,20 @@ from app.services.business_info import render_business_info
 
 white = "rgb(255, 255, 255)"
 
+# Placeholders for the per-customer values in the pre-serialized pass.json
+_SERIAL_PLACEHOLDER = "\x00serial\x00"
+_AUTH_PLACEHOLDER = "\x00auth\x00"
+_STAMPS_PLACEHOLDER = "\x00stamps\x00"
+
+# Generated .pkpass cache: {key: (expiry_timestamp, pkpass_bytes)}
+# A pass only depends on the customer fields below and the generator's
+# identity (certs, design, locale), so repeat downloads skip asset loading,
+# hashing, signing and zipping. Stamp changes alter the key.
+_pass_cache: OrderedDict[tuple, tuple[float, bytes]] = OrderedDict()
+_pass_cache_lock = threading.Lock()
+_PASS_CACHE_TTL = 300  # 5 minutes, matching the generator cache
+_PASS_CACHE_SIZE = 256
+
 def _download_from_url(url: str) -> bytes | None:
     """Download file content from a URL."""
     try:
@@ -25,6 +46,28 @@ def _download_from_url(url: str) -> bytes | None:
     return None
 
 
+@lru_cache(maxsize=4)
+def _load_default_assets(assets_dir: Path) -> tuple[dict[str, bytes], dict[str, str]]:
+    """Read the bundled icon/logo files and their SHA-1 hashes once per process."""
+    files = {}
+    for filename in ["icon.png", "icon@2x.png", "icon@3x.png", "logo.png", "logo@2x.png"]:
+        filepath = assets_dir / filename
+        if filepath.exists():
+            files[filename] = filepath.read_bytes()
+    hashes = {filename: hashlib.sha1(content).hexdigest() for filename, content in files.items()}
+    return files, hashes
+
+
+@lru_cache(maxsize=64)
+def _load_signing_material(signer_cert_pem: bytes, signer_key_pem: bytes, wwdr_cert_pem: bytes):
+    """Parse the signer cert, key and WWDR cert once per PEM set."""
+    return (
+        x509.load_pem_x509_certificate(signer_cert_pem),
+        serialization.load_pem_private_key(signer_key_pem, password=None),
+        x509.load_pem_x509_certificate(wwdr_cert_pem),
+    )
+
+
 class PassGenerator:
     def __init__(
         self,
@@ -58,6 +101,9 @@ class PassGenerator:
         else:
             self.business_name = business_name
 
+        self._identity: str | None = None
+        self._pass_json_template: bytes | None = None
+
         # Pass assets directory (relative to project root)
         self.assets_dir = Path(__file__).parent.parent.parent / "pass_assets"
 
@@ -108,6 +154,30 @@ class PassGenerator:
             strip_background_opacity=design.get("strip_background_opacity", 40),
         )
 
+    @property
+    def identity(self) -> str:
+        """Digest of everything besides customer data that shapes a pass."""
+        if self._identity is None:
+            state = orjson.dumps(
+                [
+                    self.team_id,
+                    self.pass_type_id,
+                    self.base_url,
+                    self.business_name,
+                    self.design,
+                    self.primary_locale,
+                    self.translations,
+                    self.business_settings,
+                ],
+                default=str,
+                option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+            )
+            digest = hashlib.blake2b(digest_size=16)
+            for part in (state, self.signer_cert_pem, self.signer_key_pem, self.wwdr_cert_pem):
+                digest.update(hashlib.sha256(part).digest())
+            self._identity = digest.hexdigest()
+        return self._identity
+
     def _create_pass_json(self, customer_id: str, name: str, stamps: int, auth_token: str) -> dict:
         """Create the pass.json content."""
         design = self.design
@@ -199,6 +269,23 @@ class PassGenerator:
 
         return pass_json
 
+    def _serialize_pass_json(self, customer_id: str, name: str, stamps: int, auth_token: str) -> bytes:
+        """Serialize pass.json, reusing the design-derived part across customers.
+
+        The dict is built and dumped once per generator with placeholders, then
+        only the serial number, auth token and stamp count are substituted.
+        """
+        if self._pass_json_template is None:
+            self._pass_json_template = orjson.dumps(
+                self._create_pass_json(_SERIAL_PLACEHOLDER, name, _STAMPS_PLACEHOLDER, _AUTH_PLACEHOLDER)
+            )
+        return (
+            self._pass_json_template
+            .replace(orjson.dumps(_SERIAL_PLACEHOLDER), orjson.dumps(customer_id))
+            .replace(orjson.dumps(_AUTH_PLACEHOLDER), orjson.dumps(auth_token))
+            .replace(orjson.dumps(_STAMPS_PLACEHOLDER)[1:-1], str(int(stamps)).encode())
+        )
+
     def _create_pass_strings(self, locale: str) -> bytes | None:
         """Generate Apple's pass.strings file for a locale.
 
@@ -263,20 +350,21 @@ class PassGenerator:
 
     def _create_manifest(self, files: dict[str, bytes]) -> bytes:
         """Create manifest.json with SHA-1 hashes of all files."""
+        default_files, default_hashes = _load_default_assets(self.assets_dir)
         manifest = {}
         for filename, content in files.items():
-            manifest[filename] = hashlib.sha1(content).hexdigest()
-        return json.dumps(manifest).encode("utf-8")
+            # Bundled assets were hashed when first loaded
+            if content is default_files.get(filename):
+                manifest[filename] = default_hashes[filename]
+            else:
+                manifest[filename] = hashlib.sha1(content).hexdigest()
+        return orjson.dumps(manifest)
 
     def _sign_manifest(self, manifest_data: bytes) -> bytes:
         """Create PKCS#7 detached signature using Python cryptography (in-memory)."""
-        from cryptography import x509
-        from cryptography.hazmat.primitives import hashes, serialization
-        from cryptography.hazmat.primitives.serialization import pkcs7
-
-        cert = x509.load_pem_x509_certificate(self.signer_cert_pem)
-        key = serialization.load_pem_private_key(self.signer_key_pem, password=None)
-        wwdr = x509.load_pem_x509_certificate(self.wwdr_cert_pem)
+        cert, key, wwdr = _load_signing_material(
+            self.signer_cert_pem, self.signer_key_pem, self.wwdr_cert_pem
+        )
 
         return (
             pkcs7.PKCS7SignatureBuilder()
@@ -349,15 +437,13 @@ class PassGenerator:
 
     def _get_asset_files(self, stamps: int = 0, design_id: str | None = None) -> dict[str, bytes]:
         """Load all pass asset images and get strip images."""
+        default_files, _ = _load_default_assets(self.assets_dir)
         files = {}
 
         # Load icon files from default assets
-        icon_files = ["icon.png", "icon@2x.png", "icon@3x.png"]
-        for filename in icon_files:
-            filepath = self.assets_dir / filename
-            if filepath.exists():
-                with open(filepath, "rb") as f:
-                    files[filename] = f.read()
+        for filename in ["icon.png", "icon@2x.png", "icon@3x.png"]:
+            if filename in default_files:
+                files[filename] = default_files[filename]
 
         # Load logo - check for custom design logo URL first (from Supabase Storage)
         logo_loaded = False
@@ -371,10 +457,8 @@ class PassGenerator:
         # Fall back to default logo files
         if not logo_loaded:
             for filename in ["logo.png", "logo@2x.png"]:
-                filepath = self.assets_dir / filename
-                if filepath.exists():
-                    with open(filepath, "rb") as f:
-                        files[filename] = f.read()
+                if filename in default_files:
+                    files[filename] = default_files[filename]
 
         # Get strip images (cached, pre-generated, or on-the-fly)
         strip_images = self._get_strip_images(stamps, design_id)
@@ -382,16 +466,8 @@ class PassGenerator:
 
         return files
 
-    def generate_pass(
-        self,
-        customer_id: str,
-        name: str,
-        stamps: int,
-        auth_token: str,
-        business_id: str | None = None,
-    ) -> bytes:
-        """Generate a complete .pkpass file."""
-        # If business_id is provided and we don't have a design, load it
+    def _ensure_design(self, business_id: str | None) -> None:
+        """Load the business's active design if this generator has none."""
         if business_id and not self.design:
             from app.repositories.card_design import CardDesignRepository
             design = CardDesignRepository.get_active(business_id)
@@ -402,7 +478,58 @@ class PassGenerator:
                     config=self._build_strip_config_from_design(design),
                     assets_dir=self.assets_dir,
                 )
+                self._identity = None
+                self._pass_json_template = None
+
+    def pass_etag(
+        self,
+        customer_id: str,
+        name: str,
+        stamps: int,
+        auth_token: str,
+        business_id: str | None = None,
+    ) -> str:
+        """ETag for the pass generate_pass would return, without building it.
+
+        Weak, since re-signing the same content yields different bytes.
+        """
+        self._ensure_design(business_id)
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (self.identity, customer_id, name, str(stamps), auth_token):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return f'W/"{digest.hexdigest()}"'
 
+    def generate_pass(
+        self,
+        customer_id: str,
+        name: str,
+        stamps: int,
+        auth_token: str,
+        business_id: str | None = None,
+    ) -> bytes:
+        """Generate a complete .pkpass file."""
+        self._ensure_design(business_id)
+
+        cache_key = (self.identity, customer_id, name, stamps, auth_token)
+        now = time.time()
+        with _pass_cache_lock:
+            entry = _pass_cache.get(cache_key)
+            if entry and entry[0] > now:
+                _pass_cache.move_to_end(cache_key)
+                return entry[1]
+
+        pass_data = self._build_pass(customer_id, name, stamps, auth_token)
+
+        with _pass_cache_lock:
+            _pass_cache[cache_key] = (now + _PASS_CACHE_TTL, pass_data)
+            _pass_cache.move_to_end(cache_key)
+            while len(_pass_cache) > _PASS_CACHE_SIZE:
+                _pass_cache.popitem(last=False)
+        return pass_data
+
+    def _build_pass(self, customer_id: str, name: str, stamps: int, auth_token: str) -> bytes:
+        """Build and sign the .pkpass archive."""
         # Get design_id for cached/pre-generated strip lookup
         design_id = self.design.get("id") if self.design else None
 
@@ -410,8 +537,7 @@ class PassGenerator:
         files = self._get_asset_files(stamps=stamps, design_id=design_id)
 
         # Add pass.json
-        pass_json = self._create_pass_json(customer_id, name, stamps, auth_token)
-        files["pass.json"] = json.dumps(pass_json).encode("utf-8")
+        files["pass.json"] = self._serialize_pass_json(customer_id, name, stamps, auth_token)
 
         # Add .lproj translation folders for non-primary locales
         has_any_lproj = False
@@ -444,11 +570,27 @@ class PassGenerator:
         buffer = io.BytesIO()
         with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
             for filename, content in files.items():
-                zf.writestr(filename, content)
+                # PNGs are already compressed; deflating them again only costs CPU
+                if filename.endswith(".png"):
+                    zf.writestr(filename, content, compress_type=zipfile.ZIP_STORED)
+                else:
+                    zf.writestr(filename, content)
 
         return buffer.getvalue()
 
 
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak If-None-Match comparison (RFC 7232): any listed tag, or *, matches."""
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
 def _parse_rgb(color_str: str) -> tuple[int, int, int]:
     """Parse 'rgb(r,g,b)' or '#RRGGBB' to RGB tuple."""
     if not color_str:
@@ -472,6 +614,7 @@ def create_pass_generator(design: dict | None = None) -> PassGenerator:
     Used for legacy/demo compatibility where per-business certs are not needed.
     """
     from app.core.config import settings
+    from app.services.certificate_manager import load_pem_file
 
     # If no design provided, use settings-based strip config as fallback
     strip_config = None
@@ -489,9 +632,9 @@ def create_pass_generator(design: dict | None = None) -> PassGenerator:
         team_id=settings.apple_team_id,
         pass_type_id=settings.apple_pass_type_id,
         base_url=settings.base_url,
-        signer_cert_pem=Path(settings.cert_path).read_bytes(),
-        signer_key_pem=Path(settings.key_path).read_bytes(),
-        wwdr_cert_pem=Path(settings.wwdr_path).read_bytes(),
+        signer_cert_pem=load_pem_file(settings.cert_path),
+        signer_key_pem=load_pem_file(settings.key_path),
+        wwdr_cert_pem=load_pem_file(settings.wwdr_path),
         business_name=settings.business_name,
         strip_config=strip_config,
         design=design,
@@ -507,14 +650,14 @@ def create_pass_generator_for_business(
 ) -> PassGenerator:
     """Factory that loads per-business certs via CertificateManager."""
     from app.core.config import settings, get_public_base_url
-    from app.services.certificate_manager import get_certificate_manager
+    from app.services.certificate_manager import get_certificate_manager, load_pem_file
 
     cert_manager = get_certificate_manager()
     identifier, signer_cert, signer_key, _ = cert_manager.get_certs_for_business(
         business_id
     )
 
-    wwdr_cert = Path(settings.wwdr_path).read_bytes()
+    wwdr_cert = load_pem_file(settings.wwdr_path)
 
     return PassGenerator(
         team_id=settings.apple_team_id,
@@ -2,7 +2,9 @@
 Supabase Storage service for file uploads.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
+import threading
 import uuid
 
 from database.supabase_client import get_supabase_client
@@ -15,6 +17,12 @@ class StorageService:
     BUSINESSES_BUCKET = "businesses"
     PROFILES_BUCKET = "profiles"
 
+    # Concurrent uploads for upload_files; the pool is process-wide so each
+    # worker thread keeps its own Supabase client and connections alive
+    UPLOAD_CONCURRENCY = 16
+    _upload_executor: Optional[ThreadPoolExecutor] = None
+    _upload_executor_lock = threading.Lock()
+
     def __init__(self):
         self.supabase = get_supabase_client()
 
@@ -47,6 +55,48 @@ class StorageService:
         # Get public URL
         return self.get_public_url(bucket, path)
 
+    def upload_files(
+        self,
+        bucket: str,
+        files: list[tuple[str, bytes, str]],
+    ) -> list[str]:
+        """
+        Upload many files to Supabase Storage concurrently.
+
+        Args:
+            bucket: The storage bucket name
+            files: (path, file_data, content_type) tuples
+
+        Returns:
+            The public URLs of the uploaded files, in the same order
+        """
+        def upload(item: tuple[str, bytes, str]) -> None:
+            path, file_data, content_type = item
+            # Thread-local client for the pool thread running this upload
+            get_supabase_client().storage.from_(bucket).upload(
+                path=path,
+                file=file_data,
+                file_options={"content-type": content_type, "upsert": "true"},
+            )
+
+        # Consume the results so the first failed upload raises here
+        for _ in self._get_upload_executor().map(upload, files):
+            pass
+
+        return [self.get_public_url(bucket, path) for path, _, _ in files]
+
+    @classmethod
+    def _get_upload_executor(cls) -> ThreadPoolExecutor:
+        """Get the shared thread pool used for batch uploads."""
+        if cls._upload_executor is None:
+            with cls._upload_executor_lock:
+                if cls._upload_executor is None:
+                    cls._upload_executor = ThreadPoolExecutor(
+                        max_workers=cls.UPLOAD_CONCURRENCY,
+                        thread_name_prefix="storage-upload",
+                    )
+        return cls._upload_executor
+
     def delete_file(self, bucket: str, path: str) -> bool:
         """
         Delete a file from Supabase Storage.
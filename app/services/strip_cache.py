@@ -26,6 +26,12 @@ KEY_PREFIX = "strip:"
 # Key prefix for Google URLs
 GOOGLE_URL_PREFIX = "strip_url:"
 
+# Key prefix for the render fingerprint of a design's uploaded strips
+FINGERPRINT_PREFIX = "strip_fingerprint:"
+
+# Fingerprints outlive the byte cache: they only describe what is in Storage
+FINGERPRINT_TTL = 30 * 24 * 3600
+
 
 def get_redis() -> redis.Redis:
     """Get or create Redis connection."""
@@ -71,7 +77,8 @@ def cache_strip_images(
     """
     try:
         r = get_redis()
-        pipe = r.pipeline()
+        # One round trip; the writes are independent, so skip MULTI/EXEC
+        pipe = r.pipeline(transaction=False)
 
         count = 0
         for stamp_count, resolutions in all_strips.items():
@@ -199,7 +206,8 @@ def cache_google_urls(design_id: str, urls: dict[int, str]) -> None:
     """
     try:
         r = get_redis()
-        pipe = r.pipeline()
+        # One round trip; the writes are independent, so skip MULTI/EXEC
+        pipe = r.pipeline(transaction=False)
 
         for stamp_count, url in urls.items():
             cache_key = f"{GOOGLE_URL_PREFIX}{design_id}:{stamp_count}"
@@ -233,3 +241,37 @@ def get_cached_google_url(design_id: str, stamp_count: int) -> Optional[str]:
     except Exception as e:
         logger.debug(f"Cache miss for Google URL {cache_key}: {e}")
         return None
+
+
+def get_strip_fingerprint(design_id: str) -> Optional[str]:
+    """
+    Get the render fingerprint of the strips last uploaded for a design.
+
+    Args:
+        design_id: The design ID
+
+    Returns:
+        Fingerprint hex string if known, None otherwise
+    """
+    try:
+        result = get_redis().get(f"{FINGERPRINT_PREFIX}{design_id}")
+        if result:
+            return result.decode("utf-8") if isinstance(result, bytes) else result
+        return None
+    except Exception as e:
+        logger.debug(f"Cache miss for strip fingerprint {design_id}: {e}")
+        return None
+
+
+def set_strip_fingerprint(design_id: str, fingerprint: str) -> None:
+    """
+    Record the render fingerprint of the strips just uploaded for a design.
+
+    Args:
+        design_id: The design ID
+        fingerprint: StripImageGenerator.fingerprint of the uploaded strips
+    """
+    try:
+        get_redis().setex(f"{FINGERPRINT_PREFIX}{design_id}", FINGERPRINT_TTL, fingerprint)
+    except Exception as e:
+        logger.warning(f"Failed to cache strip fingerprint: {e}")
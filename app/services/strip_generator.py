@@ -3,21 +3,46 @@ Strip image generator for Apple Wallet loyalty pass.
 Generates dynamic punch card visuals based on stamp count.
 """
 
-from dataclasses import dataclass
-from typing import Optional, Union, List
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, fields
+from typing import ClassVar, Optional, Sequence, List
 from pathlib import Path
+import functools
+import hashlib
 import io
+import os
 import re
+import threading
 
-from PIL import Image, ImageDraw, ImageFont
+import numpy as np
+from PIL import Image, ImageDraw
 
-# Optional import for SVG rendering
-try:
-    import cairosvg
-    CAIROSVG_AVAILABLE = True
-except ImportError:
-    CAIROSVG_AVAILABLE = False
 
+# Pillow >= 9.1 exposes resampling filters under Image.Resampling, while
+# Pillow-SIMD (pinned to the 9.x line) may still only expose Image.LANCZOS.
+RESAMPLE = getattr(Image, "Resampling", Image).LANCZOS
+QUANTIZE_MAXCOVERAGE = getattr(Image, "Quantize", Image).MAXCOVERAGE
+DITHER_NONE = getattr(Image, "Dither", Image).NONE
+
+# zlib level for runtime PNG encoding (strips are pushed to wallets on demand)
+PNG_COMPRESS_LEVEL = 3
+
+# On-disk cache for rasterized SVG icons (survives worker restarts)
+ICON_CACHE_DIR = Path(
+    os.getenv("ICON_CACHE_DIR", str(Path.home() / ".cache" / "fidly" / "icons"))
+)
+
+# Bundled Phosphor SVG icons (and the png/ bundles generated from them)
+ICONS_DIR = Path(__file__).parent.parent.parent / "assets" / "icons"
+
+# Sizes of the pre-rasterized white icon bundles in assets/icons/png
+# (see scripts/rasterize_icons.py)
+ICON_BUNDLE_SIZES = (32, 48, 64, 96, 144, 216, 288)
+
+# Fill colors to rewrite in icon SVGs: attribute fills (currentColor or hex)
+# and style-based fills
+_FILL_RE = re.compile(r'fill="(?:currentColor|#[0-9a-fA-F]{3,6})"|fill:[^;"}]*')
 
 # Valid predefined icon names
 ICON_NAMES = {
@@ -28,7 +53,7 @@ ICON_NAMES = {
 }
 
 
-@dataclass
+@dataclass(frozen=True)
 class CirclePosition:
     """Represents a circle with its center position and radius."""
     center_x: float
@@ -36,6 +61,15 @@ class CirclePosition:
     radius: float
     row: int
     index: int
+    # Integer bounding box (left, top, right, bottom), computed once so
+    # drawing and pasting don't redo the coercions per stamp
+    bbox: tuple[int, int, int, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        x = int(self.center_x)
+        y = int(self.center_y)
+        radius = int(self.radius)
+        object.__setattr__(self, "bbox", (x - radius, y - radius, x + radius, y + radius))
 
 
 @dataclass
@@ -102,6 +136,101 @@ class StripConfig:
     strip_background_opacity: int = 40  # 0-100, percentage opacity for background image
 
 
+def _write_icon_cache(path: Path, png_bytes: bytes) -> None:
+    """Persist a rasterized icon. Best effort: failures only cost a re-render."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file first so concurrent workers never read a partial PNG
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(png_bytes)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+@functools.lru_cache(maxsize=None)
+def _load_cairosvg():
+    """
+    Import cairosvg on first use, or return None if it is not installed.
+
+    cairosvg pulls in libcairo and is slow to import, and it is only needed
+    when an icon is missing from the pre-rasterized bundles.
+    """
+    try:
+        import cairosvg
+    except ImportError:
+        return None
+    return cairosvg
+
+
+@functools.lru_cache(maxsize=1024)
+def _rasterize_svg(svg_bytes: bytes, size: int) -> Optional[bytes]:
+    """
+    Rasterize SVG content to a square PNG of the given size.
+
+    Memoized by content, so identical SVGs share one rasterization, and
+    persisted on disk across restarts. Returns None if cairosvg is missing
+    and the result is not cached on disk.
+    """
+    disk_key = hashlib.blake2b(
+        svg_bytes + size.to_bytes(4, "little"), digest_size=16
+    ).hexdigest()
+    disk_path = ICON_CACHE_DIR / f"{disk_key}.png"
+
+    if disk_path.exists():
+        return disk_path.read_bytes()
+
+    cairosvg = _load_cairosvg()
+    if cairosvg is None:
+        return None
+
+    png_bytes = cairosvg.svg2png(
+        bytestring=svg_bytes,
+        output_width=size,
+        output_height=size
+    )
+    _write_icon_cache(disk_path, png_bytes)
+    return png_bytes
+
+
+def _config_fingerprint(config: StripConfig, assets_dir: Optional[Path]) -> bytes:
+    """
+    Hash everything that affects rendered output into a compact cache key.
+
+    Byte fields (custom icons, background image) are hashed by content so two
+    generators built from the same design share cached output. Path-based
+    inputs are hashed by file content too, so replacing a file in place
+    invalidates strips rendered from the old one.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for fld in fields(config):
+        value = getattr(config, fld.name)
+        if isinstance(value, bytes):
+            value = hashlib.blake2b(value, digest_size=16).hexdigest()
+        digest.update(f"{fld.name}={value!r};".encode())
+
+    file_inputs = {"strip_background_path": config.strip_background_path}
+    if assets_dir:
+        for name in ("custom_filled_icon", "custom_empty_icon"):
+            filename = getattr(config, name)
+            if filename:
+                file_inputs[name] = assets_dir / "stamps" / filename
+    for name, path in file_inputs.items():
+        if path:
+            digest.update(f"{name}:content={_file_digest(Path(path))};".encode())
+
+    digest.update(f"assets_dir={assets_dir!s}".encode())
+    return digest.digest()
+
+
+def _file_digest(path: Path) -> str:
+    """Hash a file's contents for cache keys ("missing" if unreadable)."""
+    try:
+        return hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+    except OSError:
+        return "missing"
+
+
 def get_row_distribution(count: int) -> List[int]:
     """
     Get the row distribution for a given circle count.
@@ -253,9 +382,58 @@ def calculate_circle_layout(
     )
 
 
+@functools.lru_cache(maxsize=64)
+def _stamp_layout(
+    count: int,
+    width: int,
+    stamp_area_height: int,
+    stamp_area_offset: int,
+    min_padding: int,
+    side_padding: int,
+) -> tuple[tuple[CirclePosition, ...], int]:
+    """Cached stamp positions (offset into the stamp area) and border width."""
+    layout = calculate_circle_layout(
+        count=count,
+        canvas_width=width,
+        canvas_height=stamp_area_height,
+        min_padding=min_padding,
+        side_padding=side_padding
+    )
+
+    # Calculate border width proportional to radius
+    border_width = max(1, int(layout.radius / 20)) if layout.radius > 0 else 1
+
+    # Offset Y positions to account for stamp area position
+    circles = tuple(
+        CirclePosition(
+            center_x=circle.center_x,
+            center_y=circle.center_y + stamp_area_offset,
+            radius=circle.radius,
+            row=circle.row,
+            index=circle.index
+        )
+        for circle in layout.circles
+    )
+    return circles, border_width
+
+
 class StripImageGenerator:
     """Generates strip.png images for Apple Wallet passes."""
 
+    # Shared across instances, created on first use
+    _executor: ClassVar[Optional[ThreadPoolExecutor]] = None
+    _executor_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    # Process-wide LRU of rendered predefined icons keyed by (icon, color, size)
+    ICON_CACHE_SIZE: ClassVar[int] = 1024
+    _icon_cache: ClassVar["OrderedDict[str, Image.Image]"] = OrderedDict()
+    _icon_cache_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    # Process-wide LRU of encoded PNGs keyed by (config fingerprint, stamps, output)
+    OUTPUT_CACHE_SIZE: ClassVar[int] = 512
+    _output_cache: ClassVar["OrderedDict[tuple, bytes]"] = OrderedDict()
+    _output_cache_lock: ClassVar[threading.Lock] = threading.Lock()
+
     def __init__(
         self,
         config: Optional[StripConfig] = None,
@@ -265,9 +443,32 @@ class StripImageGenerator:
         self.assets_dir = assets_dir
         self._custom_filled: Optional[Image.Image] = None
         self._custom_empty: Optional[Image.Image] = None
-        self._icon_cache: dict[str, Image.Image] = {}
+        # Config is treated as immutable for the generator's lifetime, so
+        # rendered backgrounds can be reused across calls
+        self._bg_cache: dict[tuple[int, int], Image.Image] = {}
+        self._resized_icon_cache: dict[tuple[bool, int], Image.Image] = {}
+        self._stamp_tile_cache: dict[tuple, tuple[Image.Image, Image.Image]] = {}
+        self._stamp_mask_cache: dict[int, Image.Image] = {}
+        self._empty_template_cache: dict[tuple[int, int], Image.Image] = {}
+        # Decoded custom background, loaded on first use and shared by all sizes
+        self._background_source: Optional[Image.Image] = None
+        self._background_loaded = False
+        self._background_lock = threading.Lock()
+        # Encoded PNGs are deterministic per config and stamp count, so they are
+        # shared process-wide under this fingerprint
+        self._config_key = _config_fingerprint(self.config, self.assets_dir)
+        self._has_custom_background = (
+            self.config.strip_background_data is not None or
+            (self.config.strip_background_path is not None and
+             Path(self.config.strip_background_path).exists())
+        )
         self._load_custom_icons()
 
+    @property
+    def fingerprint(self) -> str:
+        """Hex digest of everything that affects this generator's output."""
+        return self._config_key.hex()
+
     def _load_custom_icons(self) -> None:
         """Load custom stamp icons if configured (from bytes or file paths)."""
         # First try loading from bytes data (Supabase Storage)
@@ -304,7 +505,7 @@ class StripImageGenerator:
 
     def _get_icons_dir(self) -> Path:
         """Get path to bundled icons directory."""
-        return Path(__file__).parent.parent.parent / "assets" / "icons"
+        return ICONS_DIR
 
     def _load_icon(
         self,
@@ -313,16 +514,22 @@ class StripImageGenerator:
         size: int
     ) -> Optional[Image.Image]:
         """Load SVG icon and render with custom color at specified size."""
-        if not CAIROSVG_AVAILABLE:
-            return None
-
         if icon_name not in ICON_NAMES:
             return None
 
         # Create cache key
         cache_key = f"{icon_name}_{color}_{size}"
-        if cache_key in self._icon_cache:
-            return self._icon_cache[cache_key]
+        with self._icon_cache_lock:
+            icon_img = self._icon_cache.get(cache_key)
+            if icon_img is not None:
+                self._icon_cache.move_to_end(cache_key)
+                return icon_img
+
+        # Prefer pre-rasterized bundles, which skip cairosvg entirely
+        icon_img = self._load_bundled_icon(icon_name, color, size)
+        if icon_img is not None:
+            self._cache_icon(cache_key, icon_img)
+            return icon_img
 
         svg_path = self._get_icons_dir() / f"{icon_name}.svg"
         if not svg_path.exists():
@@ -335,64 +542,103 @@ class StripImageGenerator:
             # Replace fill color in SVG (Phosphor uses currentColor or #000)
             hex_color = f"#{color[0]:02x}{color[1]:02x}{color[2]:02x}"
 
-            # Replace fill="currentColor" and fill="#000000" etc.
-            svg_content = svg_content.replace('fill="currentColor"', f'fill="{hex_color}"')
-            svg_content = re.sub(r'fill="#[0-9a-fA-F]{3,6}"', f'fill="{hex_color}"', svg_content)
-
-            # Also handle style-based fills
-            svg_content = re.sub(r'fill:[^;"}]*', f'fill:{hex_color}', svg_content)
-
-            # Render SVG to PNG bytes
-            png_bytes = cairosvg.svg2png(
-                bytestring=svg_content.encode(),
-                output_width=size,
-                output_height=size
+            # Replace fill="currentColor", fill="#000000" etc. and style-based fills
+            attr_fill = f'fill="{hex_color}"'
+            style_fill = f"fill:{hex_color}"
+            svg_content = _FILL_RE.sub(
+                lambda m: attr_fill if m.group(0)[4] == "=" else style_fill,
+                svg_content,
             )
 
+            png_bytes = _rasterize_svg(svg_content.encode(), size)
+            if png_bytes is None:
+                return None
+
             # Convert to PIL Image
             icon_img = Image.open(io.BytesIO(png_bytes)).convert("RGBA")
-            self._icon_cache[cache_key] = icon_img
+            self._cache_icon(cache_key, icon_img)
             return icon_img
 
         except Exception:
             # Fall back gracefully if SVG rendering fails
             return None
 
+    def _cache_icon(self, cache_key: str, icon_img: Image.Image) -> None:
+        """Store a rendered icon, evicting the least recently used entries."""
+        with self._icon_cache_lock:
+            self._icon_cache[cache_key] = icon_img
+            self._icon_cache.move_to_end(cache_key)
+            while len(self._icon_cache) > self.ICON_CACHE_SIZE:
+                self._icon_cache.popitem(last=False)
+
+    def _load_bundled_icon(
+        self,
+        icon_name: str,
+        color: tuple[int, int, int],
+        size: int
+    ) -> Optional[Image.Image]:
+        """
+        Load a pre-rasterized white icon and recolor it.
+
+        Picks the smallest bundled size that is at least the requested size
+        (or the largest available), resizes if needed, then replaces the RGB
+        channels with the icon color while keeping the alpha channel.
+        Bundles are produced by scripts/rasterize_icons.py.
+        """
+        png_dir = self._get_icons_dir() / "png"
+        candidates = [s for s in ICON_BUNDLE_SIZES if s >= size] or [ICON_BUNDLE_SIZES[-1]]
+        png_path = png_dir / f"{icon_name}_{candidates[0]}.png"
+        if not png_path.exists():
+            return None
+
+        try:
+            icon_img = Image.open(png_path).convert("RGBA")
+            if icon_img.size != (size, size):
+                icon_img = icon_img.resize((size, size), RESAMPLE)
+
+            pixels = np.array(icon_img)
+            pixels[..., :3] = color
+            return Image.fromarray(pixels)
+        except Exception:
+            return None
+
     def _create_background(self, width: int, height: int) -> Image.Image:
-        """Create the background with optional custom image or gradient."""
+        """Get a fresh copy of the background for the given dimensions."""
+        key = (width, height)
+        if key not in self._bg_cache:
+            self._bg_cache[key] = self._render_background(width, height)
+        return self._bg_cache[key].copy()
+
+    def _render_background(self, width: int, height: int) -> Image.Image:
+        """Render the background with optional custom image or gradient."""
         # Load custom background image if available
         bg_img = None
-        if self.config.strip_background_data:
-            try:
-                bg_img = Image.open(io.BytesIO(self.config.strip_background_data)).convert("RGBA")
-                bg_img = self._resize_cover(bg_img, width, height)
-            except Exception:
-                bg_img = None
-
-        if bg_img is None and self.config.strip_background_path:
-            bg_path = Path(self.config.strip_background_path)
-            if bg_path.exists():
-                try:
-                    bg_img = Image.open(bg_path).convert("RGBA")
-                    bg_img = self._resize_cover(bg_img, width, height)
-                except Exception:
-                    bg_img = None
+        source = self._get_background_source()
+        if source is not None:
+            bg_img = self._resize_cover(source, width, height)
 
-        # Create solid color base
-        base = Image.new("RGBA", (width, height), self.config.background_color + (255,))
-
-        # Apply gradient if configured
         if self.config.background_gradient_end:
-            draw = ImageDraw.Draw(base)
-            r1, g1, b1 = self.config.background_color
-            r2, g2, b2 = self.config.background_gradient_end
-
-            for y in range(height):
-                ratio = y / height
-                r = int(r1 + (r2 - r1) * ratio)
-                g = int(g1 + (g2 - g1) * ratio)
-                b = int(b1 + (b2 - b1) * ratio)
-                draw.line([(0, y), (width, y)], fill=(r, g, b, 255))
+            # Vertical gradient: interpolate one color per row, then broadcast across width,
+            # using exact integer arithmetic: start + (end - start) * y // height
+            start = np.array(self.config.background_color, dtype=np.int32)
+            end = np.array(self.config.background_gradient_end, dtype=np.int32)
+            rows = np.arange(height, dtype=np.int32)[:, None]
+            row_colors = (start + ((end - start) * rows) // height).astype(np.uint32)
+
+            # Pack each row color as a little-endian RGBA word so every pixel
+            # is written with a single 32-bit store
+            packed = (
+                row_colors[:, 0]
+                | (row_colors[:, 1] << 8)
+                | (row_colors[:, 2] << 16)
+                | (0xFF << 24)
+            ).astype("<u4")
+            pixels = np.empty((height, width), dtype="<u4")
+            pixels[:] = packed[:, None]
+            base = Image.frombuffer("RGBA", (width, height), pixels, "raw", "RGBA", 0, 1)
+        else:
+            # Create solid color base
+            base = Image.new("RGBA", (width, height), self.config.background_color + (255,))
 
         # Composite custom background image over the solid color base at configured opacity
         if bg_img is not None:
@@ -406,6 +652,38 @@ class StripImageGenerator:
 
         return base.convert("RGB")
 
+    def _get_background_source(self) -> Optional[Image.Image]:
+        """Decode the custom background image once (from bytes or file path)."""
+        if self._background_loaded:
+            return self._background_source
+
+        # Generators are shared across threads; concurrent renders must wait
+        # for the decode rather than see an unset source
+        with self._background_lock:
+            if self._background_loaded:
+                return self._background_source
+
+            source = None
+            if self.config.strip_background_data:
+                try:
+                    source = Image.open(
+                        io.BytesIO(self.config.strip_background_data)
+                    ).convert("RGBA")
+                except Exception:
+                    source = None
+
+            if source is None and self.config.strip_background_path:
+                bg_path = Path(self.config.strip_background_path)
+                if bg_path.exists():
+                    try:
+                        source = Image.open(bg_path).convert("RGBA")
+                    except Exception:
+                        source = None
+
+            self._background_source = source
+            self._background_loaded = True
+        return self._background_source
+
     def _resize_cover(self, img: Image.Image, target_width: int, target_height: int) -> Image.Image:
         """Resize image to cover target dimensions, prioritizing full width coverage."""
         # Always scale to fill the full width
@@ -420,7 +698,7 @@ class StripImageGenerator:
             new_width = int(img.width * scale)
         
         # Resize
-        img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        img = img.resize((new_width, new_height), RESAMPLE)
         
         # Crop to target size (centered)
         left = (new_width - target_width) // 2
@@ -453,8 +731,7 @@ class StripImageGenerator:
         """Draw a stamp circle with optional icon."""
         x = int(circle.center_x)
         y = int(circle.center_y)
-        radius = int(circle.radius)
-        
+
         fill_color = (
             self.config.stamp_filled_color if filled else self.config.stamp_empty_color
         )
@@ -462,13 +739,10 @@ class StripImageGenerator:
         # Draw the circle background
         # Filled stamps have no outline, empty stamps have outline
         if filled:
-            draw.ellipse(
-                [x - radius, y - radius, x + radius, y + radius],
-                fill=fill_color,
-            )
+            draw.ellipse(circle.bbox, fill=fill_color)
         else:
             draw.ellipse(
-                [x - radius, y - radius, x + radius, y + radius],
+                circle.bbox,
                 fill=fill_color,
                 outline=self.config.stamp_border_color,
                 width=border_width,
@@ -495,6 +769,65 @@ class StripImageGenerator:
                 else:
                     img.paste(icon_img, (paste_x, paste_y), icon_img)
 
+    def _get_stamp_tile(
+        self,
+        radius: float,
+        filled: bool,
+        is_last: bool,
+        border_width: int,
+    ) -> tuple[Image.Image, Image.Image]:
+        """
+        Get a pre-rendered stamp tile and its circular paste mask.
+
+        Every stamp of a given kind is identical, so the circle (and icon) is
+        rasterized once and then blitted at each position instead of being
+        redrawn per stamp.
+        """
+        # Only filled stamps differ between regular and reward icons
+        is_last = is_last and filled
+        key = (radius, filled, is_last, border_width)
+        cached = self._stamp_tile_cache.get(key)
+        if cached is not None:
+            return cached
+
+        int_radius = int(radius)
+        size = int_radius * 2 + 1
+
+        tile = Image.new("RGB", (size, size))
+        self._draw_stamp(
+            tile,
+            ImageDraw.Draw(tile),
+            CirclePosition(
+                center_x=int_radius,
+                center_y=int_radius,
+                radius=radius,
+                row=0,
+                index=0,
+            ),
+            filled,
+            is_last,
+            border_width,
+        )
+
+        mask = self._get_stamp_mask(int_radius)
+        self._stamp_tile_cache[key] = (tile, mask)
+        return tile, mask
+
+    def _get_stamp_mask(self, radius: int) -> Image.Image:
+        """
+        Get the circular paste mask for stamp tiles of the given radius.
+
+        Shared by all tile variants of that radius. It is rasterized with the
+        same ellipse routine as the tiles so the footprints match exactly.
+        """
+        mask = self._stamp_mask_cache.get(radius)
+        if mask is None:
+            size = radius * 2 + 1
+            mask = Image.new("L", (size, size), 0)
+            ImageDraw.Draw(mask).ellipse([0, 0, size - 1, size - 1], fill=255)
+            self._stamp_mask_cache[radius] = mask
+        return mask
+
     def _paste_custom_icon(
         self,
         img: Image.Image,
@@ -506,65 +839,42 @@ class StripImageGenerator:
         if icon is None:
             return False
 
-        x = int(circle.center_x)
-        y = int(circle.center_y)
-        radius = int(circle.radius)
-
-        # Resize icon to fit stamp size
-        size = radius * 2
-        resized = icon.resize((size, size), Image.Resampling.LANCZOS)
-
-        # Center the icon at (x, y)
-        paste_x = x - radius
-        paste_y = y - radius
+        left, top, right, _ = circle.bbox
+        radius = (right - left) // 2
 
-        # Convert main image to RGBA for pasting with transparency
-        if img.mode != "RGBA":
-            img = img.convert("RGBA")
+        # Resize icon to fit stamp size (once per filled state and radius)
+        key = (filled, radius)
+        resized = self._resized_icon_cache.get(key)
+        if resized is None:
+            size = radius * 2
+            resized = icon.resize((size, size), RESAMPLE)
+            self._resized_icon_cache[key] = resized
 
-        img.paste(resized, (paste_x, paste_y), resized)
+        # Paste in place using the icon's alpha channel as mask. This blends
+        # only the icon's bounding box and works on the RGB canvas directly.
+        img.paste(resized, (left, top), resized)
         return True
 
-    def _get_font(self, size: int) -> Union[ImageFont.FreeTypeFont, ImageFont.ImageFont]:
-        """Get a font, falling back to default if needed."""
-        font_paths = [
-            "/System/Library/Fonts/Helvetica.ttc",
-            "/System/Library/Fonts/SFNSText.ttf",
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-            "/usr/share/fonts/TTF/DejaVuSans.ttf",
-        ]
-
-        for font_path in font_paths:
-            try:
-                return ImageFont.truetype(font_path, size)
-            except (OSError, IOError):
-                continue
-
-        return ImageFont.load_default()
-
-    def _generate_at_scale(self, stamps: int, scale: int) -> bytes:
-        """Generate strip image at a specific scale (1, 2, or 3)."""
+    def _render_image(self, stamps: int, scale: int) -> Image.Image:
+        """Render the strip image at a specific scale (1, 2, or 3)."""
         # Scale dimensions
         width = (self.config.width * scale) // 3
         height = (self.config.height * scale) // 3
-        min_padding = (self.config.min_padding * scale) // 3
 
         # Clamp stamps to valid range
         stamps = max(0, min(stamps, self.config.total_stamps))
 
-        # Check if we have a custom background image
-        has_custom_background = (
-            self.config.strip_background_data is not None or
-            (self.config.strip_background_path is not None and 
-             Path(self.config.strip_background_path).exists())
-        )
+        circles, border_width = self._get_apple_stamp_layout(scale)
+        return self._compose_strip(width, height, circles, stamps, border_width)
 
-        # Create background (full height)
-        img = self._create_background(width, height)
-        draw = ImageDraw.Draw(img)
+    def _get_apple_stamp_layout(self, scale: int) -> tuple[Sequence[CirclePosition], int]:
+        """Get the stamp layout for the Apple strip at a specific scale."""
+        width = (self.config.width * scale) // 3
+        height = (self.config.height * scale) // 3
+        min_padding = (self.config.min_padding * scale) // 3
 
         # Determine stamp area based on background
-        if has_custom_background:
+        if self._has_custom_background:
             # With custom background: 24px top and bottom padding
             top_padding = (24 * scale) // 3
             bottom_padding = (24 * scale) // 3
@@ -575,62 +885,229 @@ class StripImageGenerator:
             stamp_area_height = height
             stamp_area_offset = 0
 
-        # Calculate circle layout for the stamp area
-        layout = calculate_circle_layout(
-            count=self.config.total_stamps,
-            canvas_width=width,
-            canvas_height=stamp_area_height,
+        return self._get_stamp_layout(
+            width=width,
+            stamp_area_height=stamp_area_height,
+            stamp_area_offset=stamp_area_offset,
             min_padding=min_padding,
-            side_padding=(self.config.side_padding * scale) // 3
+            side_padding=(self.config.side_padding * scale) // 3,
         )
 
-        # Calculate border width proportional to radius
-        border_width = max(1, int(layout.radius / 20)) if layout.radius > 0 else 1
-
-        # Draw stamps
-        for circle in layout.circles:
-            # Offset Y position to account for stamp area position
-            adjusted_circle = CirclePosition(
-                center_x=circle.center_x,
-                center_y=circle.center_y + stamp_area_offset,
-                radius=circle.radius,
-                row=circle.row,
-                index=circle.index
-            )
-            
+    def _get_hero_stamp_layout(self, width: int, height: int) -> tuple[Sequence[CirclePosition], int]:
+        """Get the stamp layout for a Google Wallet hero image."""
+        # Calculate padding proportional to height
+        # Google hero is shorter than Apple, so scale padding accordingly
+        scale_factor = height / self.config.height  # ~0.78 for 336/432
+
+        # Determine stamp area based on background
+        if self._has_custom_background:
+            # With custom background: proportional padding
+            top_padding = int(24 * scale_factor)
+            bottom_padding = int(24 * scale_factor)
+            stamp_area_height = height - top_padding - bottom_padding
+            stamp_area_offset = top_padding
+        else:
+            # No custom background: use full height
+            stamp_area_height = height
+            stamp_area_offset = 0
+
+        # Scale padding proportionally
+        return self._get_stamp_layout(
+            width=width,
+            stamp_area_height=stamp_area_height,
+            stamp_area_offset=stamp_area_offset,
+            min_padding=int(self.config.min_padding * scale_factor),
+            side_padding=int(self.config.side_padding * scale_factor),
+        )
+
+    def _icon_sizes(self) -> set[int]:
+        """Icon sizes this config renders for the @3x strip and default hero."""
+        sizes = set()
+        for circles, _ in (
+            self._get_apple_stamp_layout(3),
+            self._get_hero_stamp_layout(1032, 336),
+        ):
+            if circles:
+                sizes.add(self._calculate_icon_size(circles[0].radius))
+        return sizes
+
+    def _compose_strip(
+        self,
+        width: int,
+        height: int,
+        circles: Sequence[CirclePosition],
+        stamps: int,
+        border_width: int,
+    ) -> Image.Image:
+        """
+        Draw the background and stamps for the given layout.
+
+        With predefined-icon stamps, a filled tile fully covers the empty
+        stamp beneath it, so the background with all empty stamps is rendered
+        once per size and only the filled stamps are pasted on a copy.
+        Custom icons may be non-circular or translucent, so they are drawn on
+        a clean background instead.
+        """
+        if self._custom_filled is not None or self._custom_empty is not None:
+            img = self._create_background(width, height)
+            self._draw_stamps(img, circles, stamps, border_width)
+            return img
+
+        key = (width, height)
+        template = self._empty_template_cache.get(key)
+        if template is None:
+            template = self._create_background(width, height)
+            self._draw_stamps(template, circles, 0, border_width)
+            self._empty_template_cache[key] = template
+
+        img = template.copy()
+        self._draw_stamps(img, circles[:stamps], stamps, border_width)
+        return img
+
+    def _get_stamp_layout(
+        self,
+        width: int,
+        stamp_area_height: int,
+        stamp_area_offset: int,
+        min_padding: int,
+        side_padding: int,
+    ) -> tuple[Sequence[CirclePosition], int]:
+        """
+        Get stamp circle positions (offset into the stamp area) and border width.
+
+        The layout only depends on the canvas geometry and total_stamps, not on
+        the number of filled stamps, so it is shared across generators.
+        """
+        return _stamp_layout(
+            self.config.total_stamps,
+            width,
+            stamp_area_height,
+            stamp_area_offset,
+            min_padding,
+            side_padding,
+        )
+
+    def _draw_stamps(
+        self,
+        img: Image.Image,
+        circles: Sequence[CirclePosition],
+        stamps: int,
+        border_width: int,
+    ) -> None:
+        """Draw every stamp of the layout, filling the first `stamps` ones."""
+        for circle in circles:
             filled = circle.index < stamps
             is_last = (circle.index == self.config.total_stamps - 1)
 
             # Try custom icons first (legacy support)
             if filled and self._custom_filled:
-                self._paste_custom_icon(img, adjusted_circle, True)
+                self._paste_custom_icon(img, circle, True)
             elif not filled and self._custom_empty:
-                self._paste_custom_icon(img, adjusted_circle, False)
+                self._paste_custom_icon(img, circle, False)
             else:
-                # Use stamp drawing with predefined icons
-                self._draw_stamp(img, draw, adjusted_circle, filled, is_last, border_width)
-
-        # Convert to PNG bytes
+                # Use pre-rendered stamp tile with predefined icons
+                tile, mask = self._get_stamp_tile(circle.radius, filled, is_last, border_width)
+                img.paste(tile, circle.bbox[:2], mask)
+
+    def _encode_png(self, img: Image.Image) -> bytes:
+        """Encode an image to PNG bytes."""
+        # optimize=True and high zlib levels cost far more CPU than they save
+        # in size on strip artwork; level 3 is ~2x faster than 6 for ~5% bytes
         buffer = io.BytesIO()
-        img.save(buffer, format="PNG", optimize=True)
+        # Flat artwork rarely uses more than a few dozen colors; storing it as
+        # a palette PNG with exactly those colors is lossless and much smaller.
+        # Photographic backgrounds exceed 256 colors and stay RGB.
+        colors = img.getcolors(256)
+        if colors is not None:
+            img = img.quantize(
+                colors=len(colors), method=QUANTIZE_MAXCOVERAGE, dither=DITHER_NONE
+            )
+        img.save(buffer, format="PNG", compress_level=PNG_COMPRESS_LEVEL)
         return buffer.getvalue()
 
     def generate(self, stamps: int) -> bytes:
         """Generate strip image at @3x resolution."""
-        return self._generate_at_scale(stamps, scale=3)
+        stamps = max(0, min(stamps, self.config.total_stamps))
+        key = (stamps, "strip@3x.png")
+        image_data = self._get_cached_png(key)
+        if image_data is None:
+            image_data = self._encode_png(self._render_image(stamps, scale=3))
+            self._cache_png(key, image_data)
+        return image_data
 
     def generate_all_resolutions(self, stamps: int) -> dict[str, bytes]:
         """
         Generate strip images for all required resolutions.
 
+        The @3x image is rendered once and downsampled for @2x and @1x,
+        which is much cheaper than rasterizing the stamps three times.
+
         Returns dict with keys: 'strip.png', 'strip@2x.png', 'strip@3x.png'
         """
-        return {
-            "strip.png": self._generate_at_scale(stamps, scale=1),
-            "strip@2x.png": self._generate_at_scale(stamps, scale=2),
-            "strip@3x.png": self._generate_at_scale(stamps, scale=3),
+        stamps = max(0, min(stamps, self.config.total_stamps))
+        filenames = ("strip.png", "strip@2x.png", "strip@3x.png")
+        cached = {filename: self._get_cached_png((stamps, filename)) for filename in filenames}
+        if all(image_data is not None for image_data in cached.values()):
+            return cached
+
+        img_3x = self._render_image(stamps, scale=3)
+        targets = {
+            "strip.png": (self.config.width // 3, self.config.height // 3),
+            "strip@2x.png": ((self.config.width * 2) // 3, (self.config.height * 2) // 3),
+            "strip@3x.png": None,
         }
 
+        # Pillow releases the GIL while resizing and encoding, so the three
+        # variants can be produced concurrently
+        executor = self._get_executor()
+        futures = {
+            filename: executor.submit(self._downsample_and_encode, img_3x, size)
+            for filename, size in targets.items()
+        }
+        images = {filename: future.result() for filename, future in futures.items()}
+        for filename, image_data in images.items():
+            self._cache_png((stamps, filename), image_data)
+        return images
+
+    def _get_cached_png(self, key: tuple) -> Optional[bytes]:
+        """Look up encoded PNG bytes for this generator's config."""
+        cache_key = (self._config_key,) + key
+        with self._output_cache_lock:
+            image_data = self._output_cache.get(cache_key)
+            if image_data is not None:
+                self._output_cache.move_to_end(cache_key)
+            return image_data
+
+    def _cache_png(self, key: tuple, image_data: bytes) -> None:
+        """Store encoded PNG bytes, evicting the least recently used entries."""
+        cache_key = (self._config_key,) + key
+        with self._output_cache_lock:
+            self._output_cache[cache_key] = image_data
+            self._output_cache.move_to_end(cache_key)
+            while len(self._output_cache) > self.OUTPUT_CACHE_SIZE:
+                self._output_cache.popitem(last=False)
+
+    def _downsample_and_encode(
+        self,
+        img: Image.Image,
+        size: Optional[tuple[int, int]],
+    ) -> bytes:
+        """Resize the image to the given size (if any) and encode it to PNG."""
+        if size is not None:
+            img = img.resize(size, RESAMPLE)
+        return self._encode_png(img)
+
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        """Get the shared thread pool used for per-resolution work."""
+        if cls._executor is None:
+            with cls._executor_lock:
+                if cls._executor is None:
+                    cls._executor = ThreadPoolExecutor(
+                        max_workers=3, thread_name_prefix="strip-generator"
+                    )
+        return cls._executor
+
     def generate_google_hero(
         self,
         stamps: int,
@@ -654,73 +1131,48 @@ class StripImageGenerator:
         # Clamp stamps to valid range
         stamps = max(0, min(stamps, self.config.total_stamps))
 
-        # Check if we have a custom background image
-        has_custom_background = (
-            self.config.strip_background_data is not None or
-            (self.config.strip_background_path is not None and
-             Path(self.config.strip_background_path).exists())
-        )
-
-        # Create background at Google hero dimensions
-        img = self._create_background(width, height)
-        draw = ImageDraw.Draw(img)
-
-        # Calculate padding proportional to height
-        # Google hero is shorter than Apple, so scale padding accordingly
-        scale_factor = height / self.config.height  # ~0.78 for 336/432
-
-        # Determine stamp area based on background
-        if has_custom_background:
-            # With custom background: proportional padding
-            top_padding = int(24 * scale_factor)
-            bottom_padding = int(24 * scale_factor)
-            stamp_area_height = height - top_padding - bottom_padding
-            stamp_area_offset = top_padding
-        else:
-            # No custom background: use full height
-            stamp_area_height = height
-            stamp_area_offset = 0
-
-        # Scale padding proportionally
-        min_padding = int(self.config.min_padding * scale_factor)
-        side_padding = int(self.config.side_padding * scale_factor)
-
-        # Calculate circle layout for Google dimensions
-        layout = calculate_circle_layout(
-            count=self.config.total_stamps,
-            canvas_width=width,
-            canvas_height=stamp_area_height,
-            min_padding=min_padding,
-            side_padding=side_padding
-        )
-
-        # Calculate border width proportional to radius
-        border_width = max(1, int(layout.radius / 20)) if layout.radius > 0 else 1
-
-        # Draw stamps
-        for circle in layout.circles:
-            # Offset Y position to account for stamp area position
-            adjusted_circle = CirclePosition(
-                center_x=circle.center_x,
-                center_y=circle.center_y + stamp_area_offset,
-                radius=circle.radius,
-                row=circle.row,
-                index=circle.index
-            )
-
-            filled = circle.index < stamps
-            is_last = (circle.index == self.config.total_stamps - 1)
+        key = (stamps, "hero", width, height)
+        image_data = self._get_cached_png(key)
+        if image_data is None:
+            image_data = self._encode_png(self._render_google_hero(stamps, width, height))
+            self._cache_png(key, image_data)
+        return image_data
+
+    def _render_google_hero(self, stamps: int, width: int, height: int) -> Image.Image:
+        """Render the Google Wallet hero image at the given dimensions."""
+        circles, border_width = self._get_hero_stamp_layout(width, height)
+        return self._compose_strip(width, height, circles, stamps, border_width)
+
+
+def warm_icon_cache(
+    colors: Sequence[tuple[int, int, int]] = ((255, 255, 255), (0, 0, 0)),
+    sizes: Optional[Sequence[int]] = None,
+    total_stamps: Sequence[int] = (6, 8, 10, 12),
+    stop: Optional[threading.Event] = None,
+) -> int:
+    """
+    Pre-rasterize predefined stamp icons so first requests skip cairosvg.
 
-            # Try custom icons first (legacy support)
-            if filled and self._custom_filled:
-                self._paste_custom_icon(img, adjusted_circle, True)
-            elif not filled and self._custom_empty:
-                self._paste_custom_icon(img, adjusted_circle, False)
-            else:
-                # Use stamp drawing with predefined icons
-                self._draw_stamp(img, draw, adjusted_circle, filled, is_last, border_width)
+    Covers ICON_NAMES x colors x sizes. When sizes aren't given, they are the
+    icon sizes used by the @3x strip and Google hero layouts for the given
+    stamp counts. Setting ``stop`` ends warming early (e.g. on shutdown).
 
-        # Convert to PNG bytes
-        buffer = io.BytesIO()
-        img.save(buffer, format="PNG", optimize=True)
-        return buffer.getvalue()
\ No newline at end of file
+    Returns:
+        Number of icons rendered into the cache
+    """
+    if sizes is None:
+        icon_sizes: set[int] = set()
+        for count in total_stamps:
+            icon_sizes.update(StripImageGenerator(StripConfig(total_stamps=count))._icon_sizes())
+        sizes = sorted(icon_sizes)
+
+    generator = StripImageGenerator()
+    warmed = 0
+    for icon_name in sorted(ICON_NAMES):
+        for color in colors:
+            for size in sizes:
+                if stop is not None and stop.is_set():
+                    return warmed
+                if generator._load_icon(icon_name, color, size) is not None:
+                    warmed += 1
+    return warmed
\ No newline at end of file
@@ -6,15 +6,88 @@ wrapping the existing PassGenerator and APNsClient.
 """
 
 import asyncio
-from pathlib import Path
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
 from typing import Optional
 
 from app.core.config import settings, get_public_base_url
 from app.services.apns import APNsClient, create_apns_client, create_apns_client_for_business, create_demo_apns_client
 from app.services.pass_generator import PassGenerator, create_pass_generator_for_business
-from app.services.certificate_manager import get_certificate_manager
+from app.services.certificate_manager import get_certificate_manager, load_pem_file
 from app.repositories.wallet_registration import WalletRegistrationRepository
 from app.repositories.card_design import CardDesignRepository
+from app.repositories.business import BusinessRepository
+
+# Per-business PassGenerator cache: {key: (expiry_timestamp, generator)}
+# Building a generator decrypts certs and downloads custom strip assets, while
+# the design only changes when a merchant edits it (which changes the key).
+# The key also fingerprints the business's certs, so a re-upload or pool
+# reassignment is picked up without waiting out the TTL.
+_generator_cache: OrderedDict[tuple, tuple[float, PassGenerator]] = OrderedDict()
+_generator_cache_lock = threading.Lock()
+_GENERATOR_TTL = 300  # 5 minutes, matching the in-memory cert cache
+_GENERATOR_CACHE_SIZE = 128
+
+# Per-business APNs client cache: {business_id: (expiry_timestamp, client)}
+# Reusing clients keeps their HTTP/2 connections (and TLS sessions) alive
+# between push bursts; the TTL re-checks the certs, and a client is only
+# replaced (and closed) when they changed.
+_apns_client_cache: OrderedDict[str | None, tuple[float, APNsClient]] = OrderedDict()
+_apns_client_cache_lock = threading.Lock()
+_APNS_CLIENT_TTL = 300
+_APNS_CLIENT_CACHE_SIZE = 128
+
+# Business primary locale cache: {business_id: (expiry_timestamp, locale)}
+_locale_cache: OrderedDict[str, tuple[float, str]] = OrderedDict()
+_locale_cache_lock = threading.Lock()
+_LOCALE_TTL = 60
+_LOCALE_CACHE_SIZE = 1024
+
+
+def _get_business_locale(business_id: str) -> str:
+    """Get a business's primary locale, cached briefly across pass downloads."""
+    now = time.time()
+    with _locale_cache_lock:
+        entry = _locale_cache.get(business_id)
+        if entry and entry[0] > now:
+            _locale_cache.move_to_end(business_id)
+            return entry[1]
+
+    business = BusinessRepository.get_by_id(business_id)
+    primary_locale = business.get("primary_locale", "fr") if business else "fr"
+    with _locale_cache_lock:
+        _locale_cache[business_id] = (now + _LOCALE_TTL, primary_locale)
+        _locale_cache.move_to_end(business_id)
+        while len(_locale_cache) > _LOCALE_CACHE_SIZE:
+            _locale_cache.popitem(last=False)
+    return primary_locale
+
+
+# Long-lived event loop for sync callers, started on first use
+_background_loop: asyncio.AbstractEventLoop | None = None
+_background_loop_lock = threading.Lock()
+
+
+def run_coroutine_sync(coro):
+    """
+    Run a coroutine to completion from synchronous code.
+
+    Coroutines run on one event loop in a daemon thread instead of a new
+    thread and event loop per call, so APNs connections opened there are
+    reused across calls.
+    """
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="wallet-sync-loop", daemon=True
+            ).start()
+            _background_loop = loop
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop).result()
 
 
 class AppleWalletService:
@@ -42,26 +115,55 @@ class AppleWalletService:
         """Get or create a PassGenerator instance.
 
         If business_id is provided, loads per-business certs via CertificateManager.
+        Per-business generators are reused for a few minutes per design.
         """
         if self._pass_generator:
             return self._pass_generator
 
         if business_id:
-            return create_pass_generator_for_business(
+            identifier, signer_cert, _, _ = get_certificate_manager().get_certs_for_business(
+                business_id
+            )
+            cert_digest = hashlib.blake2b(digest_size=16)
+            cert_digest.update(identifier.encode("utf-8"))
+            cert_digest.update(b"\x00")
+            cert_digest.update(signer_cert)
+            key = (
+                business_id,
+                cert_digest.hexdigest(),
+                json.dumps(design, sort_keys=True, default=str),
+                primary_locale,
+                json.dumps(translations, sort_keys=True, default=str),
+            )
+            now = time.time()
+            with _generator_cache_lock:
+                entry = _generator_cache.get(key)
+                if entry and entry[0] > now:
+                    _generator_cache.move_to_end(key)
+                    return entry[1]
+
+            generator = create_pass_generator_for_business(
                 business_id,
                 design=design,
                 primary_locale=primary_locale,
                 translations=translations,
             )
 
+            with _generator_cache_lock:
+                _generator_cache[key] = (now + _GENERATOR_TTL, generator)
+                _generator_cache.move_to_end(key)
+                while len(_generator_cache) > _GENERATOR_CACHE_SIZE:
+                    _generator_cache.popitem(last=False)
+            return generator
+
         # Fallback to shared certs (legacy/demo)
         return PassGenerator(
             team_id=settings.apple_team_id,
             pass_type_id=settings.apple_pass_type_id,
             base_url=get_public_base_url(),
-            signer_cert_pem=Path(settings.cert_path).read_bytes(),
-            signer_key_pem=Path(settings.key_path).read_bytes(),
-            wwdr_cert_pem=Path(settings.wwdr_path).read_bytes(),
+            signer_cert_pem=load_pem_file(settings.cert_path),
+            signer_key_pem=load_pem_file(settings.key_path),
+            wwdr_cert_pem=load_pem_file(settings.wwdr_path),
             design=design,
             primary_locale=primary_locale,
             translations=translations,
@@ -70,15 +172,41 @@ class AppleWalletService:
     def _get_apns_client(self, business_id: str | None = None) -> APNsClient:
         """Get or create an APNsClient instance.
 
-        If business_id is provided, loads per-business certs.
+        If business_id is provided, loads per-business certs. Clients are
+        shared per business for a few minutes so connections stay warm.
         """
         if self._apns_client:
             return self._apns_client
 
-        if business_id:
-            return create_apns_client_for_business(business_id)
+        now = time.time()
+        with _apns_client_cache_lock:
+            entry = _apns_client_cache.get(business_id)
+            if entry and entry[0] > now:
+                _apns_client_cache.move_to_end(business_id)
+                return entry[1]
 
-        return create_apns_client()
+        if business_id:
+            client = create_apns_client_for_business(business_id)
+        else:
+            client = create_apns_client()
+
+        stale: list[APNsClient] = []
+        with _apns_client_cache_lock:
+            entry = _apns_client_cache.get(business_id)
+            if entry and entry[1].identity == client.identity:
+                # Same certs: keep the warm client and its connections
+                client = entry[1]
+            elif entry:
+                stale.append(entry[1])
+            _apns_client_cache[business_id] = (now + _APNS_CLIENT_TTL, client)
+            _apns_client_cache.move_to_end(business_id)
+            while len(_apns_client_cache) > _APNS_CLIENT_CACHE_SIZE:
+                stale.append(_apns_client_cache.popitem(last=False)[1][1])
+
+        # Replaced or evicted clients would otherwise leak their HTTP/2 pools
+        for old_client in stale:
+            old_client.close()
+        return client
 
     def generate_pass(
         self,
@@ -100,10 +228,7 @@ class AppleWalletService:
         # Load locale from business
         primary_locale = "fr"
         if business_id:
-            from app.repositories.business import BusinessRepository
-            business = BusinessRepository.get_by_id(business_id)
-            if business:
-                primary_locale = business.get("primary_locale", "fr")
+            primary_locale = _get_business_locale(business_id)
 
         translations = design.get("translations") or {}
 
@@ -154,13 +279,16 @@ class AppleWalletService:
             Dict with 'success' and 'failed' counts
         """
         # Get Apple push tokens for this customer
-        push_tokens = WalletRegistrationRepository.get_apple_tokens(customer_id)
+        push_tokens = await asyncio.to_thread(
+            WalletRegistrationRepository.get_apple_tokens, customer_id
+        )
 
         if not push_tokens:
             return {"success": 0, "failed": 0, "no_devices": True}
 
         # Send push notifications
-        apns_client = self._get_apns_client(business_id=business_id)
+        # Loading business certs may hit Redis or the database
+        apns_client = await asyncio.to_thread(self._get_apns_client, business_id)
         return await apns_client.send_to_all_devices(push_tokens)
 
     def send_update_sync(
@@ -173,22 +301,7 @@ class AppleWalletService:
 
         Use this when calling from non-async code.
         """
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                # Create a new task in the running loop
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as pool:
-                    future = pool.submit(
-                        asyncio.run,
-                        self.send_update(customer_id, business_id=business_id)
-                    )
-                    return future.result()
-            else:
-                return loop.run_until_complete(self.send_update(customer_id, business_id=business_id))
-        except RuntimeError:
-            # No event loop, create one
-            return asyncio.run(self.send_update(customer_id, business_id=business_id))
+        return run_coroutine_sync(self.send_update(customer_id, business_id=business_id))
 
     async def send_update_to_all_customers(
         self,
@@ -206,19 +319,24 @@ class AppleWalletService:
             Dict with aggregate success/failed counts
         """
         # Get all Apple registrations for this business
-        registrations = WalletRegistrationRepository.get_all_apple_for_business(business_id)
+        registrations = await asyncio.to_thread(
+            WalletRegistrationRepository.get_all_apple_for_business, business_id
+        )
 
         if not registrations:
             return {"success": 0, "failed": 0, "no_devices": True}
 
-        # Collect all push tokens
-        push_tokens = [r["push_token"] for r in registrations if r.get("push_token")]
+        # Collect unique push tokens (a device can hold several registrations)
+        push_tokens = list(dict.fromkeys(
+            r["push_token"] for r in registrations if r.get("push_token")
+        ))
 
         if not push_tokens:
             return {"success": 0, "failed": 0, "no_tokens": True}
 
         # Send push notifications with per-business certs
-        apns_client = self._get_apns_client(business_id=business_id)
+        # Loading business certs may hit Redis or the database
+        apns_client = await asyncio.to_thread(self._get_apns_client, business_id)
         return await apns_client.send_to_all_devices(push_tokens)
 
 
@@ -16,10 +16,17 @@ from app.repositories.customer import CustomerRepository
 from app.repositories.card_design import CardDesignRepository
 from app.repositories.business import BusinessRepository
 from app.repositories.wallet_registration import WalletRegistrationRepository
-from app.services.wallets.apple import AppleWalletService, create_apple_wallet_service
+from app.services.wallets.apple import (
+    AppleWalletService,
+    create_apple_wallet_service,
+    run_coroutine_sync,
+)
 from app.services.wallets.google import GoogleWalletService, create_google_wallet_service
 from app.services.wallets.strips import StripImageService, create_strip_image_service
 
+# Max concurrent Google Wallet object updates when a design changes
+GOOGLE_UPDATE_CONCURRENCY = 16
+
 
 class PassCoordinator:
     """
@@ -141,37 +148,45 @@ class PassCoordinator:
         customer_id = customer["id"]
         stamp_count = customer.get("stamps", 0)
 
-        results = {
-            "apple": None,
-            "google": None,
-        }
-
-        # Update Apple Wallet (via push notification)
-        # Apple requires registration because we need the device push token
         business_id = business["id"]
-        if WalletRegistrationRepository.has_apple_wallet(customer_id):
+
+        # Apple push and Google object update are independent network calls,
+        # so run them concurrently; each reports its own error.
+        async def _update_apple() -> Optional[dict]:
+            # Update Apple Wallet (via push notification)
+            # Apple requires registration because we need the device push token;
+            # send_update loads the tokens and reports when there are none
             try:
-                results["apple"] = await self.apple.send_update(customer_id, business_id=business_id)
+                result = await self.apple.send_update(customer_id, business_id=business_id)
+                return None if result.get("no_devices") else result
             except Exception as e:
                 logger.error(f"[PassCoordinator] Apple Wallet update error: {e}")
-                results["apple"] = {"error": str(e)}
+                return {"error": str(e)}
+
+        async def _update_google() -> dict:
+            # Update Google Wallet object
+            # Unlike Apple, we don't need registration because Google object IDs are
+            # deterministic ({issuerId}.{customerId}). We always try to update since
+            # Google callbacks can be unreliable and the pass might exist without
+            # a registration in our database.
+            try:
+                await asyncio.to_thread(
+                    self.google.update_object,
+                    customer=customer,
+                    business=business,
+                    design=design,
+                    stamp_count=stamp_count,
+                )
+                return {"success": True}
+            except Exception as e:
+                logger.error(f"[PassCoordinator] Google Wallet update error: {e}")
+                return {"error": str(e)}
 
-        # Update Google Wallet object
-        # Unlike Apple, we don't need registration because Google object IDs are
-        # deterministic ({issuerId}.{customerId}). We always try to update since
-        # Google callbacks can be unreliable and the pass might exist without
-        # a registration in our database.
-        try:
-            self.google.update_object(
-                customer=customer,
-                business=business,
-                design=design,
-                stamp_count=stamp_count,
-            )
-            results["google"] = {"success": True}
-        except Exception as e:
-            logger.error(f"[PassCoordinator] Google Wallet update error: {e}")
-            results["google"] = {"error": str(e)}
+        apple_result, google_result = await asyncio.gather(_update_apple(), _update_google())
+        results = {
+            "apple": apple_result,
+            "google": google_result,
+        }
 
         return results
 
@@ -182,22 +197,7 @@ class PassCoordinator:
         design: dict,
     ) -> dict:
         """Synchronous wrapper for on_stamp_added."""
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as pool:
-                    future = pool.submit(
-                        asyncio.run,
-                        self.on_stamp_added(customer, business, design)
-                    )
-                    return future.result()
-            else:
-                return loop.run_until_complete(
-                    self.on_stamp_added(customer, business, design)
-                )
-        except RuntimeError:
-            return asyncio.run(self.on_stamp_added(customer, business, design))
+        return run_coroutine_sync(self.on_stamp_added(customer, business, design))
 
     async def on_design_updated(
         self,
@@ -227,6 +227,8 @@ class PassCoordinator:
         }
 
         business_id = business["id"]
+        # Google hero URL per stamp count, shared by all object updates below
+        hero_urls: dict[int, str | None] = {}
 
         # Regenerate strip images if needed
         if regenerate_strips:
@@ -238,22 +240,24 @@ class PassCoordinator:
                 except Exception:
                     pass  # Cache not available
 
-                await asyncio.to_thread(self.strips.delete_strips_for_design, design["id"])
                 strip_result = await asyncio.to_thread(self.strips.pregenerate_all_strips, design, business_id)
                 results["strips_regenerated"] = True
+                hero_urls.update(enumerate(strip_result.get("urls", {}).get("google", [])))
 
                 # Cache the new image bytes and URLs for fast pass generation
                 try:
                     from app.services.strip_cache import cache_strip_images, cache_google_urls
                     apple_images = strip_result.get("apple_images", {})
                     if apple_images:
-                        cache_strip_images(design["id"], apple_images)
+                        await asyncio.to_thread(cache_strip_images, design["id"], apple_images)
                         results["strips_cached"] = True
 
                     # Cache Google URLs (convert list to {stamp_count: url})
                     google_url_list = strip_result.get("urls", {}).get("google", [])
                     if google_url_list:
-                        cache_google_urls(design["id"], dict(enumerate(google_url_list)))
+                        await asyncio.to_thread(
+                            cache_google_urls, design["id"], dict(enumerate(google_url_list))
+                        )
                 except Exception as e:
                     logger.warning(f"Failed to cache strip images: {e}")
             except Exception as e:
@@ -275,29 +279,50 @@ class PassCoordinator:
             logger.error(f"Apple notifications error: {e}")
             results["apple_notifications"] = {"error": str(e)}
 
-        # Update all Google Wallet objects (CPU/IO-bound, run in thread)
-        def _update_google_objects():
-            count = 0
-            google_registrations = WalletRegistrationRepository.get_all_google_for_business(
-                business_id
+        # Update all Google Wallet objects. Customers are fetched in bulk, then
+        # each update is a blocking Google API round trip, so run them in
+        # threads with bounded concurrency to overlap the network waits.
+        def _update_google_object(reg: dict) -> bool:
+            customer = customers.get(reg["customer_id"])
+            if not customer:
+                return False
+            stamp_count = customer.get("stamps", 0)
+            # Hero URLs only depend on the stamp count, so resolve each once
+            if stamp_count not in hero_urls:
+                hero_urls[stamp_count] = self.google.get_hero_url(design["id"], stamp_count)
+            self.google.update_object(
+                customer=customer,
+                business=business,
+                design=design,
+                stamp_count=stamp_count,
+                hero_url=hero_urls[stamp_count],
             )
-            for reg in google_registrations:
+            return True
+
+        semaphore = asyncio.Semaphore(GOOGLE_UPDATE_CONCURRENCY)
+
+        async def _update_one(reg: dict) -> bool:
+            async with semaphore:
                 try:
-                    customer_id = reg["customer_id"]
-                    customer = CustomerRepository.get_by_id(customer_id)
-                    if customer:
-                        self.google.update_object(
-                            customer=customer,
-                            business=business,
-                            design=design,
-                            stamp_count=customer.get("stamps", 0),
-                        )
-                        count += 1
+                    return await asyncio.to_thread(_update_google_object, reg)
                 except Exception as e:
                     logger.error(f"Google object update error for {reg.get('customer_id')}: {e}")
-            return count
-
-        results["google_objects_updated"] = await asyncio.to_thread(_update_google_objects)
+                    return False
+
+        google_registrations = await asyncio.to_thread(
+            WalletRegistrationRepository.get_all_google_for_business, business_id
+        )
+        if google_registrations:
+            customers = await asyncio.to_thread(
+                CustomerRepository.get_by_ids,
+                [reg["customer_id"] for reg in google_registrations],
+            )
+            # Create the shared HTTP client up front instead of racing on its lazy init
+            await asyncio.to_thread(lambda: self.google.http_client)
+            outcomes = await asyncio.gather(
+                *(_update_one(reg) for reg in google_registrations)
+            )
+            results["google_objects_updated"] = sum(outcomes)
 
         return results
 
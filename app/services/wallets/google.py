@@ -5,21 +5,140 @@ Uses Generic Pass (not Loyalty Pass) to allow per-customer hero images
 that display dynamic stamp counts.
 """
 
+import copy
+import hashlib
+import json
 import logging
+import re
+import threading
 import time
+from collections import OrderedDict
+from datetime import timezone
+from functools import lru_cache
 from typing import Optional
 
 import httpx
-from google.auth import jwt as google_jwt
-from google.oauth2 import service_account
+import jwt
+import orjson
+from cryptography.hazmat.primitives import serialization
 
 from app.core.config import settings, get_callback_url, get_public_base_url
 from app.repositories.wallet_registration import WalletRegistrationRepository
-from app.repositories.strip_image import StripImageRepository
 from app.services.localization import get_system_string
 
 logger = logging.getLogger(__name__)
 
+# OAuth access tokens shared by all service instances:
+# {service_account_email: (expiry_timestamp, token)}
+_token_cache: dict[str, tuple[float, str]] = {}
+_token_lock = threading.Lock()
+_TOKEN_REFRESH_MARGIN = 60  # refresh a minute before Google expires the token
+
+# Built GenericClass payloads (without the live tunnel URLs):
+# {(class_id, business_json, design_json): payload}
+_class_payload_cache: OrderedDict[tuple, dict] = OrderedDict()
+_class_payload_lock = threading.Lock()
+_CLASS_PAYLOAD_CACHE_SIZE = 512
+
+# Hash of the last class payload this process pushed:
+# {class_id: (expiry_timestamp, hash)}. The TTL bounds how long a class
+# deleted or edited elsewhere (or by another worker) goes unrepaired.
+_class_hash_cache: dict[str, tuple[float, str]] = {}
+_class_hash_lock = threading.Lock()
+_CLASS_HASH_TTL = 300  # 5 minutes, matching the other wallet caches
+
+# Card row wrapper and item slots, indexed by number of fields in the row
+_ROW_LAYOUTS = (
+    None,
+    ("oneItem", ("item",)),
+    ("twoItems", ("startItem", "endItem")),
+    ("threeItems", ("startItem", "middleItem", "endItem")),
+)
+
+# Callback eventType -> (registration update, result flag)
+_CALLBACK_HANDLERS = {
+    "save": (WalletRegistrationRepository.register_google, "registered"),
+    "del": (WalletRegistrationRepository.unregister_google, "unregistered"),
+}
+
+_RGB_RE = re.compile(r"rgb\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*\)")
+
+
+@lru_cache(maxsize=4)
+def _load_signing_key(credentials_path: str) -> tuple[str, str, object]:
+    """
+    Load the service account's (email, key id, private key) for JWT signing.
+
+    The PEM key is parsed once per credentials file instead of on every
+    save URL.
+    """
+    with open(credentials_path) as f:
+        info = json.load(f)
+    private_key = serialization.load_pem_private_key(
+        info["private_key"].encode("utf-8"), password=None
+    )
+    return info["client_email"], info["private_key_id"], private_key
+
+
+class _AccessTokenAuth(httpx.Auth):
+    """httpx auth that attaches a fresh bearer token to every request."""
+
+    def __init__(self, get_token):
+        self._get_token = get_token
+
+    def auth_flow(self, request):
+        request.headers["Authorization"] = f"Bearer {self._get_token()}"
+        response = yield request
+        if response.status_code == 401:
+            # Token revoked or expired early: refresh once and retry
+            request.headers["Authorization"] = f"Bearer {self._get_token(force_refresh=True)}"
+            yield request
+
+
+class _HttpxResponse:
+    """google.auth transport Response backed by an httpx response."""
+
+    def __init__(self, response: httpx.Response):
+        self.status = response.status_code
+        self.headers = response.headers
+        self.data = response.content
+
+
+class _HttpxAuthRequest:
+    """
+    google.auth transport Request that sends token refreshes over httpx.
+
+    Avoids pulling requests/urllib3 in just to refresh the OAuth token.
+    """
+
+    def __init__(self, client: httpx.Client):
+        self._client = client
+
+    def __call__(self, url, method="GET", body=None, headers=None, timeout=None, **kwargs):
+        from google.auth import exceptions
+
+        try:
+            response = self._client.request(
+                method, url, content=body, headers=headers,
+                timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+            )
+        except httpx.HTTPError as e:
+            raise exceptions.TransportError(e) from e
+        return _HttpxResponse(response)
+
+
+_auth_request: Optional[_HttpxAuthRequest] = None
+
+
+def _get_auth_request() -> _HttpxAuthRequest:
+    """Get the shared transport for OAuth token refreshes."""
+    # Separate from the authenticated API client so a refresh never
+    # recurses into _AccessTokenAuth
+    global _auth_request
+    if _auth_request is None:
+        _auth_request = _HttpxAuthRequest(httpx.Client(timeout=30.0))
+    return _auth_request
+
 
 class GoogleWalletService:
     """
@@ -40,27 +159,79 @@ class GoogleWalletService:
         issuer_id: str,
     ):
         self.issuer_id = issuer_id
-        self.credentials = service_account.Credentials.from_service_account_file(
-            credentials_path,
-            scopes=["https://www.googleapis.com/auth/wallet_object.issuer"]
-        )
+        self._credentials_path = credentials_path
+        self._credentials = None
         self._http_client: Optional[httpx.Client] = None
+        # The service is shared across threads, so lazy init is guarded
+        self._init_lock = threading.Lock()
+
+    @property
+    def credentials(self):
+        """
+        Lazy-load the service account credentials.
+
+        google-auth is only imported and the key file only read once a
+        Google Wallet call is actually made.
+        """
+        if self._credentials is None:
+            with self._init_lock:
+                if self._credentials is None:
+                    from google.oauth2 import service_account
+                    self._credentials = service_account.Credentials.from_service_account_file(
+                        self._credentials_path,
+                        scopes=["https://www.googleapis.com/auth/wallet_object.issuer"]
+                    )
+        return self._credentials
+
+    def _get_access_token(self, force_refresh: bool = False) -> str:
+        """
+        Get an OAuth access token, refreshing it only when it is about to expire.
+
+        Tokens are cached per service account across service instances, so
+        most requests skip the token refresh round trip.
+        """
+        key = self.credentials.service_account_email
+        with _token_lock:
+            entry = _token_cache.get(key)
+            if not force_refresh and entry and entry[0] - _TOKEN_REFRESH_MARGIN > time.time():
+                return entry[1]
+
+            self.credentials.refresh(_get_auth_request())
+
+            # google-auth reports expiry as a naive UTC datetime
+            expiry = self.credentials.expiry
+            if expiry is not None:
+                expires_at = expiry.replace(tzinfo=timezone.utc).timestamp()
+            else:
+                expires_at = time.time() + _TOKEN_REFRESH_MARGIN
+            _token_cache[key] = (expires_at, self.credentials.token)
+            return self.credentials.token
 
     @property
     def http_client(self) -> httpx.Client:
         """Lazy-initialize HTTP client with auth."""
         if self._http_client is None:
-            # Refresh credentials to get access token
-            from google.auth.transport.requests import Request
-            self.credentials.refresh(Request())
-
-            self._http_client = httpx.Client(
-                headers={
-                    "Authorization": f"Bearer {self.credentials.token}",
-                    "Content-Type": "application/json",
-                },
-                timeout=30.0,
-            )
+            with self._init_lock:
+                if self._http_client is None:
+                    # The bearer token is attached per request so long-lived clients
+                    # keep working after the hour-long token expires
+                    # All calls go to one host, so keep connections alive and let
+                    # HTTP/2 multiplex concurrent object updates over them
+                    self._http_client = httpx.Client(
+                        auth=_AccessTokenAuth(self._get_access_token),
+                        headers={"Content-Type": "application/json"},
+                        # retries only cover failed connection attempts
+                        transport=httpx.HTTPTransport(
+                            http2=True,
+                            retries=2,
+                            limits=httpx.Limits(
+                                max_connections=32,
+                                max_keepalive_connections=16,
+                                keepalive_expiry=300.0,
+                            ),
+                        ),
+                        timeout=httpx.Timeout(30.0, connect=5.0),
+                    )
         return self._http_client
 
     @staticmethod
@@ -115,12 +286,51 @@ class GoogleWalletService:
         """
         Build GenericClass payload for Google Wallet API.
 
-        The class is shared by all customers of a business.
+        The class is shared by all customers of a business. The template only
+        changes with the business or design, so it is built once per version
+        and the tunnel-dependent URLs are filled in on every call.
         """
         class_id = self._get_class_id(business["id"])
+        key = (
+            class_id,
+            json.dumps(
+                [business["id"], business.get("name"), business.get("primary_locale")]
+            ),
+            json.dumps(design, sort_keys=True, default=str),
+        )
+
+        with _class_payload_lock:
+            template = _class_payload_cache.get(key)
+            if template is not None:
+                _class_payload_cache.move_to_end(key)
+
+        if template is None:
+            template = self._build_class_template(class_id, business, design)
+            with _class_payload_lock:
+                _class_payload_cache[key] = template
+                while len(_class_payload_cache) > _CLASS_PAYLOAD_CACHE_SIZE:
+                    _class_payload_cache.popitem(last=False)
+
+        # Callers may mutate the payload, so never hand out the cached dict
+        payload = copy.deepcopy(template)
         callback_url = get_callback_url()
+        payload["linksModuleData"]["uris"][0]["uri"] = (
+            f"{get_public_base_url()}/business/{business['id']}"
+        )
+        payload["callbackOptions"] = {
+            "url": callback_url,
+            "updateRequestUrl": callback_url,
+        }
+        return payload
+
+    def _build_class_template(
+        self,
+        class_id: str,
+        business: dict,
+        design: dict,
+    ) -> dict:
+        """Build the static part of the GenericClass payload."""
         primary_locale = business.get("primary_locale", "fr")
-        translations = design.get("translations") or {}
 
         # Parse background color for card
         bg_color = design.get("background_color", "rgb(139, 90, 43)")
@@ -142,7 +352,7 @@ class GoogleWalletService:
             "linksModuleData": {
                 "uris": [
                     {
-                        "uri": f"{get_public_base_url()}/business/{business['id']}",
+                        "uri": None,  # filled in by _build_class_payload
                         "description": link_description,
                         "id": "website"
                     }
@@ -150,10 +360,6 @@ class GoogleWalletService:
             },
             "enableSmartTap": False,
             "hexBackgroundColor": hex_color,
-            "callbackOptions": {
-                "url": callback_url,
-                "updateRequestUrl": callback_url,
-            },
         }
 
         # Only add heroImage if we have a valid logo URL
@@ -173,37 +379,45 @@ class GoogleWalletService:
 
         return payload
 
+    def get_hero_url(self, design_id: str, stamp_count: int) -> str | None:
+        """Get the pre-generated hero image URL (try cache first, then database)."""
+        hero_url = None
+        try:
+            from app.services.strip_cache import get_cached_google_url
+            hero_url = get_cached_google_url(design_id, stamp_count)
+        except Exception:
+            pass
+
+        if not hero_url:
+            from app.repositories.strip_image import StripImageRepository
+            hero_url = StripImageRepository.get_google_hero_url(
+                design_id=design_id,
+                stamp_count=stamp_count,
+            )
+        return hero_url
+
     def _build_object_payload(
         self,
         customer: dict,
         business: dict,
         design: dict,
         stamp_count: int,
+        hero_url: str | None = None,
     ) -> dict:
         """
         Build GenericObject payload for Google Wallet API.
 
         Each customer has their own object with a unique hero image
-        showing their current stamp count.
+        showing their current stamp count. Callers updating many objects
+        can pass the hero_url they already resolved for this stamp count.
         """
         class_id = self._get_class_id(business["id"])
         object_id = self._get_object_id(customer["id"])
         primary_locale = business.get("primary_locale", "fr")
         translations = design.get("translations") or {}
 
-        # Get pre-generated hero image URL (try cache first, then database)
-        hero_url = None
-        try:
-            from app.services.strip_cache import get_cached_google_url
-            hero_url = get_cached_google_url(design["id"], stamp_count)
-        except Exception:
-            pass
-
-        if not hero_url:
-            hero_url = StripImageRepository.get_google_hero_url(
-                design_id=design["id"],
-                stamp_count=stamp_count,
-            )
+        if hero_url is None:
+            hero_url = self.get_hero_url(design["id"], stamp_count)
 
         total_stamps = design.get("total_stamps", 10)
         description = design.get("description", "Loyalty Card")
@@ -239,51 +453,31 @@ class GoogleWalletService:
             }
         ]
 
-        # Secondary fields (displayed on card front - row 2)
-        secondary_fields = design.get("secondary_fields", [])
-        text_modules.extend(
-            self._convert_pass_fields_to_text_modules(
-                secondary_fields, "sec_",
-                translations=translations, primary_locale=primary_locale,
-                array_key="secondary_fields",
-            )
-        )
-
-        # Auxiliary fields (displayed on card front - one row)
-        auxiliary_fields = design.get("auxiliary_fields", [])
-        text_modules.extend(
-            self._convert_pass_fields_to_text_modules(
-                auxiliary_fields, "aux_",
-                translations=translations, primary_locale=primary_locale,
-                array_key="auxiliary_fields",
-            )
-        )
-
         # Business info fields (from business settings, merged before design back_fields)
-        from app.services.business_info import render_business_info
+        visible_biz_fields: list[dict] = []
         business_settings = business.get("settings") or {}
         biz_info = business_settings.get("business_info", [])
         if biz_info:
+            from app.services.business_info import render_business_info
             biz_fields = render_business_info(biz_info, primary_locale)
             hidden_keys = set(design.get("hidden_business_info_keys", []))
             visible_biz_fields = [f for f in biz_fields if f["key"] not in hidden_keys]
-            text_modules.extend(
-                self._convert_pass_fields_to_text_modules(
-                    visible_biz_fields, "biz_",
-                    translations=None, primary_locale=primary_locale,
-                    array_key=None,
-                )
-            )
 
-        # Back fields (displayed in details section only - not in cardRowTemplateInfos)
-        back_fields = design.get("back_fields", [])
-        text_modules.extend(
-            self._convert_pass_fields_to_text_modules(
-                back_fields, "back_",
-                translations=translations, primary_locale=primary_locale,
-                array_key="back_fields",
-            )
-        )
+        # Secondary (card front, row 2), auxiliary (card front, row 3),
+        # business info, then back fields (details section only - not in
+        # cardRowTemplateInfos), appended straight into one list
+        for fields, prefix, array_key in (
+            (design.get("secondary_fields", []), "sec_", "secondary_fields"),
+            (design.get("auxiliary_fields", []), "aux_", "auxiliary_fields"),
+            (visible_biz_fields, "biz_", None),
+            (design.get("back_fields", []), "back_", "back_fields"),
+        ):
+            if fields:
+                self._append_text_modules(
+                    text_modules, fields, prefix,
+                    translations=translations, primary_locale=primary_locale,
+                    array_key=array_key,
+                )
 
         business_name = business.get("name", "Loyalty Card")
 
@@ -350,11 +544,16 @@ class GoogleWalletService:
 
         return payload
 
-    def _rgb_to_hex(self, rgb_str: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _rgb_to_hex(rgb_str: str) -> str:
         """Convert 'rgb(r,g,b)' or '#RRGGBB' to '#RRGGBB'."""
         if not rgb_str:
             return "#8B5A2B"
 
+        if rgb_str[0] == "#" and len(rgb_str) == 7:
+            return rgb_str
+
         rgb_str = rgb_str.strip()
 
         if rgb_str.startswith("#"):
@@ -364,38 +563,35 @@ class GoogleWalletService:
                 return f"#{rgb_str[1]*2}{rgb_str[2]*2}{rgb_str[3]*2}"
             return rgb_str
 
-        if rgb_str.startswith("rgb(") and rgb_str.endswith(")"):
-            try:
-                values = rgb_str[4:-1].split(",")
-                r, g, b = [int(v.strip()) for v in values]
-                return f"#{r:02x}{g:02x}{b:02x}"
-            except (ValueError, IndexError):
-                pass
+        match = _RGB_RE.fullmatch(rgb_str)
+        if match:
+            r, g, b = map(int, match.groups())
+            return f"#{r:02x}{g:02x}{b:02x}"
 
         return "#8B5A2B"  # Default brown
 
-    def _convert_pass_fields_to_text_modules(
+    def _append_text_modules(
         self,
+        modules: list[dict],
         fields: list[dict],
         prefix: str,
         translations: dict | None = None,
         primary_locale: str = "fr",
         array_key: str | None = None,
-    ) -> list[dict]:
+    ) -> None:
         """
         Convert Apple Wallet PassField format to Google Wallet textModulesData.
 
         Args:
+            modules: textModulesData list to append the converted fields to
             fields: List of {key, label, value} dicts from design
             prefix: ID prefix ('sec_', 'aux_', 'back_') for uniqueness
             translations: Design translations dict keyed by locale,
                           e.g. {"en": {"secondary_fields": [{"key":"reward","label":"Reward","value":"..."}]}}
             primary_locale: ISO locale code for the primary language
             array_key: The design array name (e.g. 'secondary_fields') used
-                       to look up per-field translations
-
-        Returns:
-            List of {id, header, body} dicts for textModulesData
+                       to look up per-field translations; None disables
+                       translation lookup
         """
         # Pre-build a lookup: locale -> field_key -> {label, value}
         trans_lookup: dict[str, dict[str, dict]] = {}
@@ -407,7 +603,6 @@ class GoogleWalletService:
                     if isinstance(tf, dict) and "key" in tf:
                         trans_lookup.setdefault(locale, {})[tf["key"]] = tf
 
-        modules = []
         for field in fields:
             field_key = field["key"]
             module: dict = {
@@ -441,7 +636,6 @@ class GoogleWalletService:
                     }
 
             modules.append(module)
-        return modules
 
     def _build_card_row_template_infos(self, design: dict) -> list[dict]:
         """
@@ -498,57 +692,20 @@ class GoogleWalletService:
         if not fields:
             return None
 
-        field_paths = [
-            {"fieldPath": f"object.textModulesData['{prefix}{field['key']}']"}
-            for field in fields
-        ]
-
-        if len(field_paths) == 1:
-            return {
-                "oneItem": {
-                    "item": {
-                        "firstValue": {
-                            "fields": [field_paths[0]]
-                        }
-                    }
-                }
-            }
-        elif len(field_paths) == 2:
-            return {
-                "twoItems": {
-                    "startItem": {
-                        "firstValue": {
-                            "fields": [field_paths[0]]
-                        }
-                    },
-                    "endItem": {
-                        "firstValue": {
-                            "fields": [field_paths[1]]
-                        }
-                    }
-                }
-            }
-        else:
-            # 3 or more fields - use threeItems (max supported by Google)
-            return {
-                "threeItems": {
-                    "startItem": {
-                        "firstValue": {
-                            "fields": [field_paths[0]]
-                        }
-                    },
-                    "middleItem": {
-                        "firstValue": {
-                            "fields": [field_paths[1]]
-                        }
-                    },
-                    "endItem": {
-                        "firstValue": {
-                            "fields": [field_paths[2]]
-                        }
+        # 3 or more fields use threeItems (max supported by Google)
+        wrapper, slots = _ROW_LAYOUTS[min(len(fields), 3)]
+        return {
+            wrapper: {
+                slot: {
+                    "firstValue": {
+                        "fields": [
+                            {"fieldPath": f"object.textModulesData['{prefix}{field['key']}']"}
+                        ]
                     }
                 }
+                for slot, field in zip(slots, fields)
             }
+        }
 
     def create_or_update_class(
         self,
@@ -560,32 +717,49 @@ class GoogleWalletService:
 
         Returns the class ID.
         """
-        class_id = self._get_class_id(business["id"])
         payload = self._build_class_payload(business, design)
+        class_id = payload["id"]
+        body = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+        payload_hash = hashlib.blake2b(body, digest_size=16).hexdigest()
+
+        # Skip the round trips when this process recently pushed this exact class
+        with _class_hash_lock:
+            entry = _class_hash_cache.get(class_id)
+        known_hash = entry[1] if entry and entry[0] > time.time() else None
+        if known_hash == payload_hash:
+            return class_id
+
+        if known_hash is None:
+            # Try to get existing class
+            response = self.http_client.get(
+                f"{self.WALLET_API_BASE}/genericClass/{class_id}"
+            )
+            exists = response.status_code == 200
+            if response.status_code not in (200, 404):
+                response.raise_for_status()
+        else:
+            # This process already created or updated the class
+            exists = True
 
-        # Try to get existing class
-        response = self.http_client.get(
-            f"{self.WALLET_API_BASE}/genericClass/{class_id}"
-        )
-
-        if response.status_code == 200:
+        response = None
+        if exists:
             # Class exists, update it
             response = self.http_client.put(
                 f"{self.WALLET_API_BASE}/genericClass/{class_id}",
-                json=payload,
+                content=body,
             )
-        elif response.status_code == 404:
+        if response is None or response.status_code == 404:
             # Class doesn't exist, create it
             response = self.http_client.post(
                 f"{self.WALLET_API_BASE}/genericClass",
-                json=payload,
+                content=body,
             )
-        else:
-            response.raise_for_status()
 
         if response.status_code not in (200, 201):
             response.raise_for_status()
 
+        with _class_hash_lock:
+            _class_hash_cache[class_id] = (time.time() + _CLASS_HASH_TTL, payload_hash)
         return class_id
 
     def create_object(
@@ -594,18 +768,25 @@ class GoogleWalletService:
         business: dict,
         design: dict,
         stamp_count: int = 0,
+        hero_url: str | None = None,
     ) -> str:
         """
         Create a GenericObject for a customer.
 
         Returns the object ID.
         """
-        object_id = self._get_object_id(customer["id"])
-        payload = self._build_object_payload(customer, business, design, stamp_count)
+        payload = self._build_object_payload(
+            customer, business, design, stamp_count, hero_url=hero_url
+        )
+        object_id = payload["id"]
+        self._insert_object(payload)
+        return object_id
 
+    def _insert_object(self, payload: dict) -> None:
+        """POST a built GenericObject payload."""
         response = self.http_client.post(
             f"{self.WALLET_API_BASE}/genericObject",
-            json=payload,
+            content=orjson.dumps(payload),
         )
 
         # 409 means object already exists - that's okay
@@ -613,34 +794,40 @@ class GoogleWalletService:
             logger.error(
                 f"[Google Wallet] Create failed: {response.status_code} - {response.text}"
             )
+            if response.status_code in (400, 404) and "class" in response.text.lower():
+                # The class is gone; make the next create_or_update_class recreate it
+                with _class_hash_lock:
+                    _class_hash_cache.pop(payload["classId"], None)
             response.raise_for_status()
 
-        return object_id
-
     def update_object(
         self,
         customer: dict,
         business: dict,
         design: dict,
         stamp_count: int,
+        hero_url: str | None = None,
     ) -> str:
         """
         Update an existing GenericObject with new stamp count.
 
         Returns the object ID.
         """
-        object_id = self._get_object_id(customer["id"])
-        payload = self._build_object_payload(customer, business, design, stamp_count)
+        payload = self._build_object_payload(
+            customer, business, design, stamp_count, hero_url=hero_url
+        )
+        object_id = payload["id"]
 
         # Use PATCH for partial update
         response = self.http_client.patch(
             f"{self.WALLET_API_BASE}/genericObject/{object_id}",
-            json=payload,
+            content=orjson.dumps(payload),
         )
 
         if response.status_code == 404:
-            # Object doesn't exist, create it
-            return self.create_object(customer, business, design, stamp_count)
+            # Object doesn't exist, create it from the same payload
+            self._insert_object(payload)
+            return object_id
 
         if response.status_code not in (200, 201):
             logger.error(
@@ -672,9 +859,11 @@ class GoogleWalletService:
         # Also include class info for first-time saves
         class_payload = self._build_class_payload(business, design)
 
+        email, key_id, private_key = _load_signing_key(self._credentials_path)
+
         # Create the JWT claims
         claims = {
-            "iss": self.credentials.service_account_email,
+            "iss": email,
             "aud": "google",
             "typ": "savetowallet",
             "iat": int(time.time()),
@@ -685,8 +874,10 @@ class GoogleWalletService:
             }
         }
 
-        # Sign with service account private key using Google's JWT library
-        token = google_jwt.encode(self.credentials._signer, claims).decode("utf-8")
+        # Sign with the service account private key
+        token = jwt.encode(
+            claims, private_key, algorithm="RS256", headers={"kid": key_id}
+        )
 
         return f"{self.SAVE_URL_BASE}/{token}"
 
@@ -706,40 +897,29 @@ class GoogleWalletService:
             Dict with 'action' and 'customer_id' keys
         """
         # Extract callback type and object info
-        callback_type = callback_data.get("eventType", "")
-        class_id = callback_data.get("classId", "")
-        object_id = callback_data.get("objectId", "")
+        callback_type = callback_data.get("eventType") or ""
+        object_id = callback_data.get("objectId") or ""
 
         # Extract customer_id from object_id (format: issuerId.customerId)
-        customer_id = None
-        if object_id and "." in object_id:
-            customer_id = object_id.split(".", 1)[1]
+        customer_id = object_id.partition(".")[2] or None
 
         result = {
             "action": callback_type,
             "customer_id": customer_id,
             "object_id": object_id,
-            "class_id": class_id,
+            "class_id": callback_data.get("classId") or "",
         }
 
-        # Handle specific callback types
-        if callback_type == "save":
-            # User saved pass to wallet
-            if customer_id and object_id:
-                WalletRegistrationRepository.register_google(
+        # save: user saved pass to wallet, del: user deleted it
+        handler = _CALLBACK_HANDLERS.get(callback_type)
+        if handler:
+            update_registration, result_key = handler
+            if customer_id:
+                update_registration(
                     customer_id=customer_id,
                     google_object_id=object_id,
                 )
-            result["registered"] = True
-
-        elif callback_type == "del":
-            # User deleted pass from wallet
-            if customer_id and object_id:
-                WalletRegistrationRepository.unregister_google(
-                    customer_id=customer_id,
-                    google_object_id=object_id,
-                )
-            result["unregistered"] = True
+            result[result_key] = True
 
         return result
 
@@ -780,9 +960,27 @@ class GoogleWalletService:
             self._http_client = None
 
 
+_google_wallet_service: Optional[GoogleWalletService] = None
+_google_wallet_service_lock = threading.Lock()
+
+
 def create_google_wallet_service() -> GoogleWalletService:
-    """Factory function to create GoogleWalletService."""
-    return GoogleWalletService(
-        credentials_path=settings.google_wallet_credentials_path,
-        issuer_id=settings.google_wallet_issuer_id,
-    )
+    """Get or create the process-wide GoogleWalletService."""
+    global _google_wallet_service
+    if _google_wallet_service is None:
+        with _google_wallet_service_lock:
+            if _google_wallet_service is None:
+                _google_wallet_service = GoogleWalletService(
+                    credentials_path=settings.google_wallet_credentials_path,
+                    issuer_id=settings.google_wallet_issuer_id,
+                )
+    return _google_wallet_service
+
+
+def reset_google_wallet_service() -> None:
+    """Close and drop the shared GoogleWalletService."""
+    global _google_wallet_service
+    with _google_wallet_service_lock:
+        if _google_wallet_service is not None:
+            _google_wallet_service.close()
+            _google_wallet_service = None
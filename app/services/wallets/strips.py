@@ -8,15 +8,78 @@ Generates strip images for both Apple and Google Wallet:
 Images are uploaded to Supabase Storage and URLs stored in strip_images table.
 """
 
-from typing import Literal
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Literal, Optional
+
+import httpx
+
 from app.services.strip_generator import StripImageGenerator, StripConfig
 from app.services.storage import StorageService, get_storage_service
+from app.services.strip_cache import get_strip_fingerprint, set_strip_fingerprint
 from app.repositories.strip_image import StripImageRepository
 
+logger = logging.getLogger(__name__)
+
 
 Platform = Literal["apple", "google"]
 
+# Stamp counts rendered concurrently; Pillow releases the GIL while drawing,
+# resizing and encoding
+STRIP_RENDER_WORKERS = min(os.cpu_count() or 1, 8)
+
+# Downloaded design assets: {url: (etag, bytes)}, least recently used first.
+# Bounded by total body size, since custom backgrounds can be several MB.
+_asset_cache: OrderedDict[str, tuple[str, bytes]] = OrderedDict()
+_asset_cache_lock = threading.Lock()
+_asset_cache_bytes = 0
+ASSET_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+def _cache_asset(url: str, etag: str, content: bytes) -> None:
+    """Store a downloaded asset, evicting least recently used ones over the byte budget."""
+    global _asset_cache_bytes
+    if len(content) > ASSET_CACHE_MAX_BYTES // 4:
+        return  # Not worth evicting most of the cache for one asset
+    with _asset_cache_lock:
+        previous = _asset_cache.pop(url, None)
+        if previous is not None:
+            _asset_cache_bytes -= len(previous[1])
+        _asset_cache[url] = (etag, content)
+        _asset_cache_bytes += len(content)
+        while _asset_cache_bytes > ASSET_CACHE_MAX_BYTES:
+            _, (_, evicted) = _asset_cache.popitem(last=False)
+            _asset_cache_bytes -= len(evicted)
+
+# Network errors worth retrying when downloading design assets
+ASSET_RETRY_ERRORS = (httpx.ConnectError, httpx.RemoteProtocolError, httpx.ReadTimeout)
+ASSET_MAX_RETRIES = 3
+ASSET_RETRY_DELAY = 0.2  # seconds
+
+_http_client: Optional[httpx.Client] = None
+_http_client_lock = threading.Lock()
+
+
+def _get_http_client() -> httpx.Client:
+    """Get the shared keep-alive client used for asset downloads."""
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = httpx.Client(
+                    timeout=30.0,
+                    http2=True,
+                    limits=httpx.Limits(max_keepalive_connections=32),
+                )
+    return _http_client
 
+
+@lru_cache(maxsize=512)
 def _parse_rgb(color_str: str | None) -> tuple[int, int, int]:
     """Parse 'rgb(r,g,b)' or '#RRGGBB' to RGB tuple."""
     if not color_str:
@@ -62,19 +125,27 @@ class StripImageService:
 
     def _build_strip_config_from_design(self, design: dict) -> StripConfig:
         """Build StripConfig from a card design dict."""
-        # Download custom assets if they exist
-        custom_filled_data = None
-        custom_empty_data = None
-        strip_background_data = None
-
-        if design.get("custom_filled_stamp_path"):
-            custom_filled_data = self._download_asset(design["custom_filled_stamp_path"])
-
-        if design.get("custom_empty_stamp_path"):
-            custom_empty_data = self._download_asset(design["custom_empty_stamp_path"])
-
-        if design.get("strip_background_path"):
-            strip_background_data = self._download_asset(design["strip_background_path"])
+        # Download custom assets if they exist, concurrently
+        asset_urls = [
+            design.get("custom_filled_stamp_path"),
+            design.get("custom_empty_stamp_path"),
+            design.get("strip_background_path"),
+        ]
+        def download(url: str | None) -> bytes | None:
+            try:
+                return self._download_asset(url)
+            except Exception as e:
+                # Fail the whole generation rather than uploading strips
+                # rendered without the design's custom assets
+                logger.error(f"Failed to download design asset {url}: {e}")
+                raise
+
+        if sum(1 for url in asset_urls if url) > 1:
+            with ThreadPoolExecutor(max_workers=len(asset_urls)) as pool:
+                assets = list(pool.map(download, asset_urls))
+        else:
+            assets = [download(url) for url in asset_urls]
+        custom_filled_data, custom_empty_data, strip_background_data = assets
 
         # Get stamp filled color - support both field names
         stamp_filled_color = design.get("stamp_filled_color") or design.get("accent_color")
@@ -94,17 +165,52 @@ class StripImageService:
             strip_background_opacity=design.get("strip_background_opacity", 40),
         )
 
-    def _download_asset(self, url: str) -> bytes | None:
-        """Download an asset from URL."""
-        import httpx
-        try:
-            with httpx.Client(timeout=30.0) as client:
-                response = client.get(url)
-                if response.status_code == 200:
-                    return response.content
-        except Exception:
-            pass
-        return None
+    def _download_asset(self, url: str | None) -> bytes | None:
+        """
+        Download an asset from URL.
+
+        Assets are re-uploaded under the same path when a design changes, so
+        cached bytes are revalidated with the server's ETag rather than
+        trusted blindly; an unchanged asset costs a 304 with no body.
+
+        Returns None if there is no URL or the asset no longer exists.
+        Transient network errors are retried; other failures raise.
+        """
+        if not url:
+            return None
+
+        for attempt in range(ASSET_MAX_RETRIES + 1):
+            try:
+                return self._fetch_asset(url)
+            except ASSET_RETRY_ERRORS as e:
+                if attempt == ASSET_MAX_RETRIES:
+                    raise
+                logger.warning(
+                    f"Asset download failed, retrying ({attempt + 1}/{ASSET_MAX_RETRIES}): {url}: {e}"
+                )
+                time.sleep(ASSET_RETRY_DELAY)
+
+    def _fetch_asset(self, url: str) -> bytes | None:
+        """Single download attempt for _download_asset."""
+        with _asset_cache_lock:
+            cached = _asset_cache.get(url)
+
+        headers = {"If-None-Match": cached[0]} if cached else None
+        response = _get_http_client().get(url, headers=headers)
+        if response.status_code == 304 and cached:
+            with _asset_cache_lock:
+                if url in _asset_cache:
+                    _asset_cache.move_to_end(url)
+            return cached[1]
+        if response.status_code == 404:
+            logger.warning(f"Design asset not found, using defaults: {url}")
+            return None
+        response.raise_for_status()
+
+        etag = response.headers.get("etag")
+        if etag:
+            _cache_asset(url, etag, response.content)
+        return response.content
 
     def _generate_apple_strips(
         self,
@@ -131,26 +237,52 @@ class StripImageService:
             height=self.GOOGLE_HERO_HEIGHT,
         )
 
-    def _upload_strip(
+    def _render_stamp_count(
+        self,
+        generator: StripImageGenerator,
+        stamp_count: int,
+    ) -> tuple[dict[str, bytes], bytes]:
+        """Render the Apple strips and Google hero for one stamp count."""
+        return (
+            self._generate_apple_strips(generator, stamp_count),
+            self._generate_google_hero(generator, stamp_count),
+        )
+
+    def _render_all_stamp_counts(
+        self,
+        generator: StripImageGenerator,
+        total_stamps: int,
+    ) -> dict[int, tuple[dict[str, bytes], bytes]]:
+        """Render every stamp count from 0 to total_stamps, in parallel."""
+        # Render 0 first so the generator's per-size backgrounds and empty
+        # stamp templates are built once before the workers share them
+        rendered = {0: self._render_stamp_count(generator, 0)}
+        if total_stamps < 1:
+            return rendered
+
+        with ThreadPoolExecutor(
+            max_workers=STRIP_RENDER_WORKERS, thread_name_prefix="strip-render"
+        ) as pool:
+            futures = {
+                stamp_count: pool.submit(self._render_stamp_count, generator, stamp_count)
+                for stamp_count in range(1, total_stamps + 1)
+            }
+            for stamp_count, future in futures.items():
+                rendered[stamp_count] = future.result()
+        return rendered
+
+    def _strip_path(
         self,
         business_id: str,
         design_id: str,
         stamp_count: int,
         platform: Platform,
         resolution: str,
-        image_data: bytes,
     ) -> str:
-        """Upload a strip image to Supabase Storage and return the URL."""
+        """Get the Supabase Storage path of a strip image."""
         # Path: {business_id}/cards/{design_id}/strips/{platform}/strip_{stamp_count}@{resolution}.png
         filename = f"strip_{stamp_count}@{resolution}.png" if resolution != "hero" else f"hero_{stamp_count}.png"
-        path = f"{business_id}/cards/{design_id}/strips/{platform}/{filename}"
-
-        return self.storage.upload_file(
-            bucket=self.storage.BUSINESSES_BUCKET,
-            path=path,
-            file_data=image_data,
-            content_type="image/png",
-        )
+        return f"{business_id}/cards/{design_id}/strips/{platform}/{filename}"
 
     def pregenerate_all_strips(
         self,
@@ -179,18 +311,22 @@ class StripImageService:
         config = self._build_strip_config_from_design(design)
         generator = StripImageGenerator(config=config)
 
-        urls = {"apple": [], "google": []}
         records = []
+        # (path, bytes, content type) for each record, uploaded in one batch
+        uploads: list[tuple[str, bytes, str]] = []
 
         # Store Apple image bytes for caching
         # Format: {stamp_count: {resolution: bytes}}
         apple_images: dict[int, dict[str, bytes]] = {}
 
+        rendered = self._render_all_stamp_counts(generator, total_stamps)
+
         for stamp_count in range(total_stamps + 1):
             apple_images[stamp_count] = {}
+            apple_strips, hero_data = rendered[stamp_count]
+            images: list[tuple[Platform, str, bytes]] = []
 
-            # Generate Apple strips (all resolutions)
-            apple_strips = self._generate_apple_strips(generator, stamp_count)
+            # Apple strips (all resolutions)
             for res_name, image_data in apple_strips.items():
                 # Parse resolution from filename (strip.png -> 1x, strip@2x.png -> 2x, etc.)
                 if res_name == "strip.png":
@@ -200,45 +336,44 @@ class StripImageService:
 
                 # Store image bytes for caching
                 apple_images[stamp_count][resolution] = image_data
+                images.append(("apple", resolution, image_data))
+
+            # Google hero image
+            images.append(("google", "hero", hero_data))
 
-                url = self._upload_strip(
+            for platform, resolution, image_data in images:
+                path = self._strip_path(
                     business_id=business_id,
                     design_id=design_id,
                     stamp_count=stamp_count,
-                    platform="apple",
+                    platform=platform,
                     resolution=resolution,
-                    image_data=image_data,
                 )
-                urls["apple"].append(url)
+                uploads.append((path, image_data, "image/png"))
                 records.append({
                     "design_id": design_id,
                     "stamp_count": stamp_count,
-                    "platform": "apple",
+                    "platform": platform,
                     "resolution": resolution,
-                    "url": url,
                 })
 
-            # Generate Google hero image
-            hero_data = self._generate_google_hero(generator, stamp_count)
-            hero_url = self._upload_strip(
-                business_id=business_id,
-                design_id=design_id,
-                stamp_count=stamp_count,
-                platform="google",
-                resolution="hero",
-                image_data=hero_data,
-            )
-            urls["google"].append(hero_url)
-            records.append({
-                "design_id": design_id,
-                "stamp_count": stamp_count,
-                "platform": "google",
-                "resolution": "hero",
-                "url": hero_url,
-            })
-
-        # Batch upsert all records to database
-        StripImageRepository.upsert_batch(records)
+        bucket = self.storage.BUSINESSES_BUCKET
+        if get_strip_fingerprint(design_id) == generator.fingerprint:
+            # Same rendered output as the strips already in Storage (paths are
+            # deterministic), so only the database records need rewriting
+            uploaded_urls = [self.storage.get_public_url(bucket, path) for path, _, _ in uploads]
+        else:
+            # Upload everything concurrently instead of one request at a time
+            uploaded_urls = self.storage.upload_files(bucket=bucket, files=uploads)
+
+        urls = {"apple": [], "google": []}
+        for record, url in zip(records, uploaded_urls):
+            record["url"] = url
+            urls[record["platform"]].append(url)
+
+        # Replace the design's records (upsert + drop stale rows) in one call
+        StripImageRepository.replace_for_design(design_id, records)
+        set_strip_fingerprint(design_id, generator.fingerprint)
 
         return {
             "urls": urls,
@@ -279,7 +414,7 @@ class StripImageService:
     def delete_strips_for_design(self, design_id: str) -> int:
         """
         Delete all strip images for a design.
-        Used before regenerating strips.
+        Used when a design is deleted.
 
         Returns number of deleted records.
         """
@@ -0,0 +1,29 @@
+-- Replace a design's strip image URLs in one round trip.
+-- Upserts the given rows and removes rows for stamp counts the design no
+-- longer has, so regeneration no longer needs a separate delete first.
+CREATE OR REPLACE FUNCTION replace_strip_images(p_design_id UUID, p_records JSONB)
+RETURNS INTEGER AS $$
+DECLARE upserted INTEGER;
+BEGIN
+    INSERT INTO public.strip_images (design_id, stamp_count, platform, resolution, url)
+    SELECT p_design_id, r.stamp_count, r.platform, r.resolution, r.url
+    FROM jsonb_to_recordset(p_records)
+        AS r(stamp_count INT, platform TEXT, resolution TEXT, url TEXT)
+    ON CONFLICT (design_id, stamp_count, platform, resolution)
+    DO UPDATE SET url = EXCLUDED.url;
+    GET DIAGNOSTICS upserted = ROW_COUNT;
+
+    DELETE FROM public.strip_images s
+    WHERE s.design_id = p_design_id
+      AND NOT EXISTS (
+          SELECT 1
+          FROM jsonb_to_recordset(p_records)
+              AS r(stamp_count INT, platform TEXT, resolution TEXT)
+          WHERE r.stamp_count = s.stamp_count
+            AND r.platform = s.platform
+            AND r.resolution = s.resolution
+      );
+
+    RETURN upserted;
+END;
+$$ LANGUAGE plpgsql SET search_path = '';
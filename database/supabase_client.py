@@ -14,18 +14,22 @@ def get_supabase_client() -> Client:
     Each thread gets its own client instance, preventing "Server disconnected"
     errors that occur when stale pooled connections are reused across threads.
     """
+    client = getattr(_thread_local, "client", None)
+    if client is not None:
+        return client
+
     if not settings.supabase_url or not settings.supabase_secret_key:
         raise RuntimeError(
             "Supabase credentials not configured. "
             "Set SUPABASE_URL and SUPABASE_SECRET_KEY environment variables."
         )
 
-    if not hasattr(_thread_local, "client"):
-        _thread_local.client = create_client(
-            settings.supabase_url,
-            settings.supabase_secret_key,
-        )
-    return _thread_local.client
+    client = create_client(
+        settings.supabase_url,
+        settings.supabase_secret_key,
+    )
+    _thread_local.client = client
+    return client
 
 
 def reset_supabase_client() -> None:
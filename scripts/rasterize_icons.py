@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Pre-rasterize the predefined stamp icons into white PNG bundles.
+
+The strip generator recolors these at runtime instead of rendering the
+SVGs through cairosvg on every cold start. Run this at build time:
+    python scripts/rasterize_icons.py
+"""
+
+import io
+import sys
+from pathlib import Path
+
+import cairosvg
+from PIL import Image
+
+# Add the app to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.strip_generator import ICON_BUNDLE_SIZES, ICON_NAMES, ICONS_DIR, _FILL_RE
+
+
+def rasterize_icon(icon_name: str, size: int, output_dir: Path):
+    """Render one icon in pure white at the given size."""
+    svg_content = (ICONS_DIR / f"{icon_name}.svg").read_text()
+    svg_content = _FILL_RE.sub(
+        lambda m: 'fill="#ffffff"' if m.group(0)[4] == "=" else "fill:#ffffff",
+        svg_content,
+    )
+
+    png_bytes = cairosvg.svg2png(
+        bytestring=svg_content.encode(),
+        output_width=size,
+        output_height=size,
+    )
+    img = Image.open(io.BytesIO(png_bytes)).convert("RGBA")
+    img.save(output_dir / f"{icon_name}_{size}.png")
+
+
+def main():
+    output_dir = ICONS_DIR / "png"
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    for icon_name in sorted(ICON_NAMES):
+        if not (ICONS_DIR / f"{icon_name}.svg").exists():
+            print(f"Skipping {icon_name} (no SVG)")
+            continue
+        for size in ICON_BUNDLE_SIZES:
+            rasterize_icon(icon_name, size, output_dir)
+        print(f"Rasterized {icon_name} at {len(ICON_BUNDLE_SIZES)} sizes")
+
+    print(f"\nIcon bundles written to {output_dir}")
+
+
+if __name__ == "__main__":
+    main()